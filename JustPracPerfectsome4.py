@@ -3,32 +3,65 @@ import psutil
 import threading
 import time
 import logging
-from collections import deque
 from tkinter import ttk
 import platform
 import os
 
-# Try to import GPU monitoring libraries
-try:
-    import GPUtil
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
-    print("GPUtil not available. Install with: pip install gputil")
-
-try:
-    import pynvml
-    NVML_AVAILABLE = True
-except ImportError:
-    NVML_AVAILABLE = False
-    print("NVML not available. Install with: pip install nvidia-ml-py")
+from procfs_backend import ProcfsBackend
+from hwmon_sensors import CPU_TEMP_CHIPS, open_sensors
+from collector_daemon import RingReader, SharedMetricsCollector, RECORD_FIELDS, COMPACT_FIELDS, flatten_metrics
+from history_store import HistoryStore
+from tsdb import TieredStore
+from exporter import ExportJob, export_filename
+from prom_endpoint import MetricsEndpoint
+from ui_mailbox import UpdateMailbox
+from frame_clock import FrameClock
+from instrumentation import Instrumentation, RollingHistogram
+from gpu_backends import GpuProbe, EMPTY_GPU_METRICS, PROBING, UNAVAILABLE
+from fake_nvml import FakeNvml
 
 # Configuration constants
 class Config:
     UPDATE_INTERVAL = 1000
+    
+    # Target frame rate of the UI clock; it pauses while the window is minimised
+    UI_FPS = 20
+    
+    # How often the perf overlay text is refreshed (seconds)
+    PERF_OVERLAY_INTERVAL = 0.5
     WINDOW_SIZE = "1400x800"
     HISTORY_SIZE = 60
     
+    # Long-term history: one row per HISTORY_RESOLUTION seconds, kept for HISTORY_RETENTION rows
+    HISTORY_RESOLUTION = 1.0
+    HISTORY_RETENTION = 3600
+    
+    # On-disk history: history rows are also appended to segment files here
+    TSDB_ENABLED = True
+    TSDB_DIR = 'metrics_data'
+    TSDB_BATCH_SIZE = 60
+    TSDB_COMPACTION_INTERVAL = 60
+    
+    # Export button: history range (seconds), format ('csv', 'jsonl' or 'npz') and compression
+    EXPORT_RANGE = 3600
+    EXPORT_FORMAT = 'csv'
+    EXPORT_GZIP = False
+    
+    # Prometheus text format at http://PROMETHEUS_HOST:PROMETHEUS_PORT/metrics
+    PROMETHEUS_ENABLED = True
+    PROMETHEUS_HOST = '127.0.0.1'
+    PROMETHEUS_PORT = 9105
+    
+    # Raw samples are rolled up to 1m and 1h tiers, each with its own retention (seconds).
+    # Segments older than compress_after are Gorilla-compressed.
+    TSDB_TIERS = [
+        {'name': 'raw', 'resolution': 1, 'retention': 2 * 86400, 'segment_seconds': 3600,
+         'compress_after': 6 * 3600},
+        {'name': '1m', 'resolution': 60, 'retention': 30 * 86400, 'segment_seconds': 86400,
+         'compress_after': 2 * 86400},
+        {'name': '1h', 'resolution': 3600, 'retention': 365 * 86400, 'segment_seconds': 30 * 86400}
+    ]
+    
     COLORS = {
         'cpu': '#ff6b6b',
         'ram': '#4ecdc4',
@@ -56,177 +89,395 @@ class Config:
         'temp_critical': 85
     }
 
+    # Per-source refresh interval (seconds) and relative cost of one read
+    SOURCES = {
+        'cpu': {'interval': 0.25, 'cost': 1},
+        'ram': {'interval': 0.25, 'cost': 1},
+        'swap': {'interval': 1.0, 'cost': 1},
+        'cpu_freq': {'interval': 1.0, 'cost': 2},
+        'cpu_temp': {'interval': 2.0, 'cost': 5},
+        'gpu': {'interval': 5.0, 'cost': 20},
+        'fans': {'interval': 5.0, 'cost': 5},
+        'disk': {'interval': 30.0, 'cost': 2}
+    }
+
+    # Shortest sleep between collection passes (seconds)
+    MIN_POLL_INTERVAL = 0.05
+    
+    # A source that fails or comes back empty this many times in a row is retried
+    # with exponential backoff, up to BREAKER_MAX_BACKOFF seconds between reads
+    BREAKER_THRESHOLD = 3
+    BREAKER_MAX_BACKOFF = 300
+
+    # Simulate this many GPUs with fake_nvml.FakeNvml instead of probing real drivers (0 = off)
+    FAKE_GPU_COUNT = 0
+    
+    # Rows in the per-device GPU panel, shown when more than one GPU is found
+    GPU_PANEL_ROWS = 8
+    
+    # Read /proc and /sys directly on Linux instead of going through psutil
+    USE_PROCFS_BACKEND = True
+    PROC_ROOT = '/proc'
+    SYS_ROOT = '/sys'
+
+# Sampling Scheduler Classes
+class MetricSource:
+    """A single metric source with its own refresh interval and read cost.
+
+    A read that raises is a failure and a read that returns None is empty. A
+    failure keeps the last good value and an empty read falls back to `default`.
+    After Config.BREAKER_THRESHOLD misses in a row the breaker opens: the source
+    reports `default` and is retried with exponential backoff until a read succeeds.
+    """
+    def __init__(self, name, read_func, interval, cost=1, default=None):
+        self.name = name
+        self.read_func = read_func
+        self.interval = interval
+        self.cost = cost
+        self.default = default or {}
+        self.next_due = 0
+        self.last_sample_time = 0
+        self.last_duration = 0
+        self.value = dict(self.default)
+        
+        # Timing and failure accounting, see stats()
+        self.samples = 0
+        self.failures = 0
+        self.empty_results = 0
+        self.consecutive_misses = 0
+        self.total_duration = 0
+        self.max_duration = 0
+        self.last_error = None
+        self.durations = RollingHistogram()  # every read, for the perf overlay
+
+    def is_due(self, now):
+        return now >= self.next_due
+
+    @property
+    def breaker_open(self):
+        return self.consecutive_misses >= Config.BREAKER_THRESHOLD
+
+    def current_interval(self):
+        """Normal interval, doubled for every miss past the breaker threshold"""
+        if not self.breaker_open:
+            return self.interval
+        # Capped so a source that never reports (no GPU, no fans) can't overflow the float
+        doublings = min(self.consecutive_misses - Config.BREAKER_THRESHOLD + 1, 32)
+        backoff = self.interval * 2 ** doublings
+        return min(backoff, max(self.interval, Config.BREAKER_MAX_BACKOFF))
+
+    def sample(self, now):
+        start = time.perf_counter()
+        try:
+            value = self.read_func()
+        except Exception as e:
+            value = None
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            failed = True
+        else:
+            failed = False
+            if value is None:
+                self.empty_results += 1
+        self.last_duration = time.perf_counter() - start
+        self.total_duration += self.last_duration
+        self.max_duration = max(self.max_duration, self.last_duration)
+        self.durations.add(self.last_duration)
+        self.samples += 1
+        self.last_sample_time = now
+
+        if value is None:
+            self.consecutive_misses += 1
+            if not failed or self.breaker_open:
+                self.value = dict(self.default)
+        else:
+            self.consecutive_misses = 0
+            self.value = value
+        self.next_due = now + self.current_interval()
+        return self.value
+
+    def stats(self):
+        mean = self.total_duration / self.samples if self.samples else 0
+        return {
+            'samples': self.samples,
+            'failures': self.failures,
+            'empty_results': self.empty_results,
+            'mean_ms': mean * 1000,
+            'max_ms': self.max_duration * 1000,
+            'cost_ms_per_s': mean * 1000 / self.current_interval(),  # collector time spent per second
+            'interval': self.current_interval(),
+            'breaker_open': self.breaker_open,
+            'last_error': self.last_error
+        }
+
+class SamplingScheduler:
+    """Refreshes each registered source only when its own interval has elapsed"""
+    def __init__(self):
+        self.sources = {}
+
+    def register(self, name, read_func, interval, cost=1, default=None):
+        self.sources[name] = MetricSource(name, read_func, interval, cost, default)
+        return self.sources[name]
+
+    def run_due(self, now=None):
+        """Sample every due source, cheapest first, and return their names"""
+        now = time.monotonic() if now is None else now
+        due = [source for source in self.sources.values() if source.is_due(now)]
+        due.sort(key=lambda source: source.cost)
+
+        for source in due:
+            source.sample(now)
+        return [source.name for source in due]
+
+    def time_until_next(self, now=None):
+        now = time.monotonic() if now is None else now
+        if not self.sources:
+            return 0
+        next_due = min(source.next_due for source in self.sources.values())
+        return max(0, next_due - now)
+
+    def values(self):
+        merged = {}
+        for source in self.sources.values():
+            merged.update(source.value)
+        return merged
+
 # Metrics Collector Class
 class MetricsCollector:
-    def __init__(self):
-        self.cpu_history = deque([0] * Config.HISTORY_SIZE, maxlen=Config.HISTORY_SIZE)
-        self.ram_history = deque([0] * Config.HISTORY_SIZE, maxlen=Config.HISTORY_SIZE)
-        self.last_update = 0
+    # What each source reports before its first good read and while it has nothing to report
+    SOURCE_DEFAULTS = {
+        'cpu': {'cpu_percent': 0},
+        'ram': {'ram_percent': 0, 'ram_used': 0, 'ram_total': 0, 'ram_used_bytes': 0, 'ram_total_bytes': 0},
+        'swap': {'vram_percent': 0},
+        'cpu_freq': {'cpu_freq': 0, 'cpu_max_freq': 0},
+        'cpu_temp': {'cpu_temp': 0, 'temperatures': []},
+        'gpu': dict(EMPTY_GPU_METRICS, gpu_status=UNAVAILABLE),
+        'fans': {'fan_speeds': [{'name': 'No Fan Data', 'speed': 0}], 'fan_count': 1},
+        'disk': {'disk_percent': 0, 'disk_used': 0, 'disk_total': 0, 'disk_used_bytes': 0, 'disk_total_bytes': 0}
+    }
+    
+    def __init__(self, use_procfs=None):
+        self.history = HistoryStore(RECORD_FIELDS, Config.HISTORY_RETENTION, COMPACT_FIELDS)
+        self.last_history_time = 0
+        self.store = self.open_store() if Config.TSDB_ENABLED else None
         self.cached_metrics = {}
+        self.listeners = []
+        self.endpoint = self.open_endpoint() if Config.PROMETHEUS_ENABLED else None
+        if self.endpoint:
+            self.add_listener(self.endpoint.publish)
+
+        if use_procfs is None:
+            use_procfs = Config.USE_PROCFS_BACKEND
+        self.backend = self.create_backend() if use_procfs else None
         
-        # Initialize NVML if available
-        if NVML_AVAILABLE:
-            try:
-                pynvml.nvmlInit()
-                self.gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                self.nvml_available = True
-            except:
-                self.nvml_available = False
-        else:
-            self.nvml_available = False
+        # hwmon sensors are discovered once; the procfs backend already holds a map
+        # (None when it found no inputs, so temperatures and fans use psutil)
+        self.sensors = self.backend.sensors if self.backend else self.create_sensors()
+
+        # Each source refreshes on its own interval instead of one shared cache
+        self.scheduler = SamplingScheduler()
+        readers = {
+            'cpu': self.read_cpu,
+            'ram': self.read_ram,
+            'swap': self.read_swap,
+            'cpu_freq': self.read_cpu_freq,
+            'cpu_temp': self.read_cpu_temp,
+            'gpu': self.get_gpu_metrics,
+            'fans': self.read_fans,
+            'disk': self.read_disk
+        }
+        for name, read_func in readers.items():
+            if self.backend and name in self.backend.sources:
+                read_func = getattr(self.backend, f'read_{name}')
+            source_config = Config.SOURCES[name]
+            self.scheduler.register(name, read_func, source_config['interval'], source_config['cost'],
+                                    self.SOURCE_DEFAULTS[name])
+
+        # GPU drivers are probed in the background; the 'gpu' source reports 'probing' until then
+        nvml = FakeNvml(Config.FAKE_GPU_COUNT) if Config.FAKE_GPU_COUNT else None
+        self.gpu = GpuProbe(on_ready=self.on_gpu_ready, nvml=nvml).start()
     
-    def get_cpu_temperature(self):
-        """Get actual CPU temperature"""
+    def create_backend(self):
+        """Open the procfs/sysfs fast path when running on Linux"""
+        if platform.system() != 'Linux' or not ProcfsBackend.available(Config.PROC_ROOT):
+            return None
         try:
-            temps = psutil.sensors_temperatures()
-            if not temps:
-                return 0
-                
-            # Try different temperature sensor names
-            for sensor_name in ['coretemp', 'cpu_thermal', 'k10temp', 'acpitz']:
-                if sensor_name in temps and temps[sensor_name]:
-                    return temps[sensor_name][0].current
-                    
-            # If no specific CPU sensor, return first available temperature
-            for sensor in temps.values():
-                if sensor:
-                    return sensor[0].current
-                    
-            return 0
-        except:
-            return 0
-    
-    def get_fan_speeds(self):
-        """Get actual fan speeds from system sensors"""
+            return ProcfsBackend(Config.PROC_ROOT, Config.SYS_ROOT)
+        except (OSError, ValueError):
+            return None
+
+    def create_sensors(self):
+        """Map /sys/class/hwmon on Linux; elsewhere, or without hwmon inputs, sensors go through psutil"""
+        if platform.system() != 'Linux':
+            return None
+        return open_sensors(Config.SYS_ROOT)
+
+    def open_store(self):
+        """Persist history rows unless another process already owns the store"""
         try:
-            fans = psutil.sensors_fans()
-            fan_speeds = []
-            
-            if fans:
-                for fan_name, fan_list in fans.items():
-                    for i, fan in enumerate(fan_list):
-                        fan_speeds.append({
-                            'name': f'{fan_name} {i+1}',
-                            'speed': fan.current
-                        })
-            else:
-                # No fan data available
-                return [{'name': 'No Fan Data', 'speed': 0}]
-            
-            return fan_speeds if fan_speeds else [{'name': 'No Fans', 'speed': 0}]
+            store = TieredStore(Config.TSDB_DIR, RECORD_FIELDS, Config.TSDB_TIERS, Config.TSDB_BATCH_SIZE)
+            store.start_compaction(Config.TSDB_COMPACTION_INTERVAL)
+            return store
+        except (OSError, RuntimeError) as e:
+            logging.getLogger('SystemMonitor').warning(f"History will not be persisted: {e}")
+            return None
+
+    def open_endpoint(self):
+        """Serve /metrics unless the port is taken, e.g. by the collector daemon"""
+        try:
+            return MetricsEndpoint(Config.PROMETHEUS_HOST, Config.PROMETHEUS_PORT).start()
+        except OSError as e:
+            logging.getLogger('SystemMonitor').warning(f"Metrics endpoint disabled: {e}")
+            return None
+
+    def add_listener(self, callback):
+        """Call `callback(metrics)` once per collection cycle that refreshed a source"""
+        self.listeners.append(callback)
+
+    def close(self):
+        self.gpu.close()
+        if self.endpoint:
+            self.endpoint.stop()
+        if self.store:
+            self.store.close()
+        if self.backend:
+            self.backend.close()
+        elif self.sensors:
+            self.sensors.close()
+
+    def get_cpu_temperature(self, temps):
+        """Pick the CPU temperature out of psutil.sensors_temperatures(), or None when there is no sensor"""
+        if not temps:
+            return None
             
-        except Exception as e:
-            return [{'name': 'Fan Error', 'speed': 0}]
-    
-    def get_gpu_metrics(self):
-        """Get actual GPU metrics using available libraries"""
-        gpu_metrics = {
-            'gpu_usage': 0,
-            'gpu_frequency': 0,
-            'gpu_memory_used': 0,
-            'gpu_memory_total': 0,
-            'gpu_temperature': 0,
-            'gpu_fan_speed': 0
-        }
-        
-        # Try NVML first (NVIDIA GPUs)
-        if self.nvml_available:
-            try:
-                utilization = pynvml.nvmlDeviceGetUtilizationRates(self.gpu_handle)
-                memory_info = pynvml.nvmlDeviceGetMemoryInfo(self.gpu_handle)
+        # Try different temperature sensor names
+        for sensor_name in CPU_TEMP_CHIPS:
+            if sensor_name in temps and temps[sensor_name]:
+                return temps[sensor_name][0].current
                 
-                gpu_metrics['gpu_usage'] = utilization.gpu
-                gpu_metrics['gpu_memory_used'] = memory_info.used // (1024 * 1024)  # MB
-                gpu_metrics['gpu_memory_total'] = memory_info.total // (1024 * 1024)  # MB
+        # If no specific CPU sensor, return first available temperature
+        for sensor in temps.values():
+            if sensor:
+                return sensor[0].current
                 
-                # Try to get GPU frequency
-                try:
-                    clock_info = pynvml.nvmlDeviceGetClockInfo(self.gpu_handle, pynvml.NVML_CLOCK_GRAPHICS)
-                    gpu_metrics['gpu_frequency'] = clock_info
-                except:
-                    pass
-                    
-                # Try to get GPU temperature
-                try:
-                    temp = pynvml.nvmlDeviceGetTemperature(self.gpu_handle, pynvml.NVML_TEMPERATURE_GPU)
-                    gpu_metrics['gpu_temperature'] = temp
-                except:
-                    pass
-                    
-                # Try to get GPU fan speed
-                try:
-                    fan_speed = pynvml.nvmlDeviceGetFanSpeed(self.gpu_handle)
-                    gpu_metrics['gpu_fan_speed'] = fan_speed
-                except:
-                    pass
-                    
-            except Exception as e:
-                pass
-        
-        # Try GPUtil as fallback
-        if GPU_AVAILABLE and gpu_metrics['gpu_usage'] == 0:
-            try:
-                gpus = GPUtil.getGPUs()
-                if gpus:
-                    gpu = gpus[0]
-                    gpu_metrics['gpu_usage'] = gpu.load * 100
-                    gpu_metrics['gpu_memory_used'] = gpu.memoryUsed
-                    gpu_metrics['gpu_memory_total'] = gpu.memoryTotal
-                    gpu_metrics['gpu_temperature'] = gpu.temperature
-            except:
-                pass
-        
-        return gpu_metrics
+        return None
     
-    def get_cached_metrics(self):
-        current_time = time.time()
-        if current_time - self.last_update > 0.9:  # Cache for 0.9 seconds
-            self.cached_metrics = self._get_metrics()
-            self.last_update = current_time
-        return self.cached_metrics
-    
-    def _get_metrics(self):
-        cpu_percent = psutil.cpu_percent()
-        ram = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        swap = psutil.swap_memory()
+    def get_temperatures(self):
+        """CPU temperature and every temperature sensor, as (cpu_temp, temperatures)"""
+        if self.sensors:
+            return self.sensors.read_cpu_temp(), self.sensors.read_temperatures()
         
-        self.cpu_history.append(cpu_percent)
-        self.ram_history.append(ram.percent)
+        temps = psutil.sensors_temperatures()
+        temperatures = [
+            {'chip': chip, 'label': entry.label or f'temp{i+1}', 'current': entry.current,
+             'high': entry.high, 'critical': entry.critical}
+            for chip, entries in (temps or {}).items()
+            for i, entry in enumerate(entries)
+        ]
+        return self.get_cpu_temperature(temps), temperatures
+    
+    def get_fan_speeds(self):
+        """Get actual fan speeds from system sensors, or None when there are none"""
+        if self.sensors:
+            return self.sensors.read_fans() or None
         
-        gpu_metrics = self.get_gpu_metrics()
-        fan_speeds = self.get_fan_speeds()
-        cpu_temp = self.get_cpu_temperature()
+        fans = psutil.sensors_fans()
+        fan_speeds = []
         
-        # Get CPU frequency
-        cpu_freq = psutil.cpu_freq()
-        current_freq = cpu_freq.current if cpu_freq else 0
-        max_freq = cpu_freq.max if cpu_freq else 0
+        for fan_name, fan_list in (fans or {}).items():
+            for i, fan in enumerate(fan_list):
+                fan_speeds.append({
+                    'name': f'{fan_name} {i+1}',
+                    'speed': fan.current
+                })
         
+        return fan_speeds or None
+    
+    def get_gpu_metrics(self):
+        """Get actual GPU metrics from the first backend that reads successfully"""
+        return self.gpu.read()
+    
+    def on_gpu_ready(self, status):
+        # Called from the probe thread; resample now rather than waiting out the GPU interval
+        self.scheduler.sources['gpu'].next_due = 0
+    
+    # Source readers - each returns its slice of the metrics dict
+    def read_cpu(self):
+        return {'cpu_percent': psutil.cpu_percent()}
+
+    def read_ram(self):
+        ram = psutil.virtual_memory()
         return {
-            'cpu_percent': cpu_percent,
-            'cpu_freq': current_freq,
-            'cpu_max_freq': max_freq,
-            'cpu_temp': cpu_temp,
             'ram_percent': ram.percent,
             'ram_used': ram.used // (1024**3),  # GB
             'ram_total': ram.total // (1024**3),  # GB
+            'ram_used_bytes': ram.used,
+            'ram_total_bytes': ram.total
+        }
+
+    def read_swap(self):
+        return {'vram_percent': psutil.swap_memory().percent}
+
+    def read_cpu_freq(self):
+        cpu_freq = psutil.cpu_freq()
+        return {
+            'cpu_freq': cpu_freq.current if cpu_freq else 0,
+            'cpu_max_freq': cpu_freq.max if cpu_freq else 0
+        }
+
+    def read_cpu_temp(self):
+        cpu_temp, temperatures = self.get_temperatures()
+        if cpu_temp is None:
+            return None
+        return {'cpu_temp': cpu_temp, 'temperatures': temperatures}
+
+    def read_fans(self):
+        fan_speeds = self.get_fan_speeds()
+        if fan_speeds is None:
+            return None
+        return {'fan_speeds': fan_speeds, 'fan_count': len(fan_speeds)}
+
+    def read_disk(self):
+        disk = psutil.disk_usage('/')
+        return {
             'disk_percent': disk.percent,
             'disk_used': disk.used // (1024**3),  # GB
             'disk_total': disk.total // (1024**3),  # GB
-            'vram_percent': swap.percent,
-            'cpu_history': list(self.cpu_history),
-            'ram_history': list(self.ram_history),
-            'gpu_usage': gpu_metrics['gpu_usage'],
-            'gpu_frequency': gpu_metrics['gpu_frequency'],
-            'gpu_memory_used': gpu_metrics['gpu_memory_used'],
-            'gpu_memory_total': gpu_metrics['gpu_memory_total'],
-            'gpu_temperature': gpu_metrics['gpu_temperature'],
-            'gpu_fan_speed': gpu_metrics['gpu_fan_speed'],
-            'fan_speeds': fan_speeds,
-            'fan_count': len(fan_speeds)
+            'disk_used_bytes': disk.used,
+            'disk_total_bytes': disk.total
         }
 
+    def get_cached_metrics(self):
+        """Refresh only the sources whose interval has elapsed"""
+        refreshed = self.scheduler.run_due()
+        if refreshed or not self.cached_metrics:
+            self.cached_metrics = self._get_metrics(refreshed)
+            for listener in self.listeners:
+                listener(self.cached_metrics)
+        return self.cached_metrics
+
+    def time_until_next_sample(self):
+        return self.scheduler.time_until_next()
+
+    def _get_metrics(self, refreshed=()):
+        metrics = self.scheduler.values()
+
+        now = time.time()
+        if now - self.last_history_time >= Config.HISTORY_RESOLUTION:
+            row = flatten_metrics(metrics)
+            self.history.append(now, row)
+            if self.store:
+                self.store.append(now, row)
+            self.last_history_time = now
+
+        # Wall-clock time of this sample, for sample-to-pixel latency
+        metrics['sample_time'] = now
+        
+        # Read-only views into the history store, not copies
+        metrics['cpu_history'] = self.history.view('cpu_percent', Config.HISTORY_SIZE)
+        metrics['ram_history'] = self.history.view('ram_percent', Config.HISTORY_SIZE)
+        return metrics
+
 # Alert Manager Class
 class AlertManager:
     def __init__(self):
@@ -253,37 +504,98 @@ class Visualizer:
         self.canvas = canvas
         self.glow_items = []
         
-    def draw_circle_meter(self, x, y, radius, value, color, width=8, text="", subtext=""):
+        # Last options applied to each item, so unchanged updates never reach Tk
+        self.shadow = {}
+        self.updates_issued = 0
+        self.updates_suppressed = 0
+        
+    def draw_circle_meter(self, x, y, radius, value, color, width=8, text="", subtext="", tags=(),
+                          text_color='white', accent=False):
+        """Meter items carry `tags` plus role tags; `accent` meters follow the theme accent colour"""
+        tags = (tags,) if isinstance(tags, str) else tuple(tags)
+        value_tags = tags + ('role_accent_line',) if accent else tags
+        subtext_tags = tags + ('role_accent',) if accent else tags
+        
         # Background circle
         bg_circle = self.canvas.create_arc(
             x - radius, y - radius, 
             x + radius, y + radius, 
-            start=90, extent=359.9, outline='#333', width=width, style=tk.ARC
+            start=90, extent=359.9, outline='#333', width=width, style=tk.ARC, tags=tags
         )
         
         # Value circle
         value_circle = self.canvas.create_arc(
             x - radius, y - radius, 
             x + radius, y + radius, 
-            start=90, extent=-3.6 * value, outline=color, width=width, style=tk.ARC
+            start=90, extent=-3.6 * value, outline=color, width=width, style=tk.ARC, tags=value_tags
         )
         
         # Main text
         main_text = self.canvas.create_text(
             x, y - 10, 
-            text=text, fill='white', font=('Arial', 12, 'bold')
+            text=text, fill=text_color, font=('Arial', 12, 'bold'), tags=tags + ('role_text',)
         )
         
         # Subtext
         sub_text = self.canvas.create_text(
             x, y + 15, 
-            text=subtext, fill=color, font=('Arial', 10)
+            text=subtext, fill=color, font=('Arial', 10), tags=subtext_tags
         )
         
+        # Seed the shadow with what was just drawn
+        self.remember(bg_circle, state=tk.NORMAL)
+        self.remember(value_circle, state=tk.NORMAL, extent=self.quantise(-3.6 * value))
+        self.remember(main_text, state=tk.NORMAL, text=text)
+        self.remember(sub_text, state=tk.NORMAL, text=subtext)
+        
         return bg_circle, value_circle, main_text, sub_text
     
+    def quantise(self, value):
+        """Round floats to display precision (0.1 degree / 0.1 pixel)"""
+        return round(value, 1) if isinstance(value, float) else value
+    
+    def remember(self, item_id, **options):
+        self.shadow.setdefault(item_id, {}).update(options)
+    
+    def forget(self):
+        """Drop all shadows, e.g. after canvas.delete("all")"""
+        self.shadow.clear()
+    
+    def configure(self, item_id, **options):
+        """itemconfig with only the options that differ from the last applied ones"""
+        applied = self.shadow.setdefault(item_id, {})
+        changed = {}
+        for key, value in options.items():
+            value = self.quantise(value)
+            if applied.get(key) != value:
+                changed[key] = value
+        
+        if not changed:
+            self.updates_suppressed += 1
+            return False
+        self.canvas.itemconfig(item_id, **changed)
+        applied.update(changed)
+        self.updates_issued += 1
+        return True
+    
+    def set_coords(self, item_id, *coords):
+        """coords() unless the item is already at these (quantised) coordinates"""
+        coords = tuple(self.quantise(float(c)) for c in coords)
+        applied = self.shadow.setdefault(item_id, {})
+        if applied.get('coords') == coords:
+            self.updates_suppressed += 1
+            return False
+        self.canvas.coords(item_id, *coords)
+        applied['coords'] = coords
+        self.updates_issued += 1
+        return True
+    
+    def set_state(self, item_ids, state):
+        for item_id in item_ids:
+            self.configure(item_id, state=state)
+    
     def update_circle(self, item_id, value):
-        self.canvas.itemconfig(item_id, extent=-3.6 * value)
+        return self.configure(item_id, extent=-3.6 * value)
 
 class SystemMonitor:
     def __init__(self, root):
@@ -292,7 +604,7 @@ class SystemMonitor:
         self.root.configure(bg=Config.COLORS['bg'])
         
         # Initialize components
-        self.metrics_collector = MetricsCollector()
+        self.metrics_collector = self.create_collector()
         self.alert_manager = AlertManager()
         self.logger = self.setup_logging()
         
@@ -303,13 +615,20 @@ class SystemMonitor:
         
         # Theme and state
         self.current_theme = 'dark'
-        self.last_width = 0
-        self.last_height = 0
+        self.export_job = None
+        self.mailbox = UpdateMailbox()
+        self.clock = FrameClock(self.root, Config.UI_FPS)
+        self.instruments = Instrumentation()
+        self.layout = None
+        self.relayout_pending = None
+        
+        # Static host facts, read once rather than on every rebuild
+        self.host_info = self.read_host_info()
         
         # Initialize widgets dictionary with all required keys
         self.widgets = {
             'cpu': {}, 'ram': {}, 'gpu': {}, 'gpu_freq': {}, 'gpu_temp': {},
-            'cpu_temp': {}, 'fans': [], 'left_bar': {}, 'right_bar': {},
+            'cpu_temp': {}, 'fans': [], 'gpus': [], 'left_bar': {}, 'right_bar': {},
             'info': None, 'fps': None
         }
         
@@ -320,6 +639,28 @@ class SystemMonitor:
         # Start monitoring
         self.start_monitoring()
 
+    def create_collector(self):
+        """Share the headless collector's samples when it is running"""
+        reader = RingReader.attach()
+        if reader:
+            return SharedMetricsCollector(reader, Config.HISTORY_SIZE,
+                                          Config.HISTORY_RETENTION, Config.HISTORY_RESOLUTION,
+                                          fallback=MetricsCollector)
+        return MetricsCollector()
+
+    def read_host_info(self):
+        return {
+            'cores': psutil.cpu_count(),
+            'ram_gb': psutil.virtual_memory().total // (1024**3)
+        }
+
+    def info_text(self, gpu_memory_total=0, gpu_status='ready'):
+        if gpu_status == PROBING:
+            gpu_mem_text = "probing..."
+        else:
+            gpu_mem_text = f"{gpu_memory_total}MB" if gpu_memory_total > 0 else "No GPU"
+        return f"CPU: {self.host_info['cores']} Cores | RAM: {self.host_info['ram_gb']}GB | GPU: {gpu_mem_text}"
+
     def setup_logging(self):
         logging.basicConfig(
             level=logging.INFO,
@@ -343,8 +684,9 @@ class SystemMonitor:
         # Control buttons
         ttk.Button(control_frame, text="Theme", command=self.toggle_theme).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text="Export", command=self.export_stats).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Perf Report", command=self.export_perf_report).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text="Task Manager", command=self.open_task_manager).pack(side=tk.LEFT, padx=5)
-        ttk.Button(control_frame, text="Quit", command=self.root.quit).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(control_frame, text="Quit", command=self.on_closing).pack(side=tk.RIGHT, padx=5)
         
         # Initialize visualizer
         self.visualizer = Visualizer(self.canvas)
@@ -356,6 +698,7 @@ class SystemMonitor:
         self.root.bind('<Configure>', self.on_resize)
         self.root.bind('<F1>', lambda e: self.show_help())
         self.root.bind('<F2>', lambda e: self.toggle_theme())
+        self.root.bind('<F3>', lambda e: self.export_perf_report())
 
     def center_window(self, width, height):
         screen_width = self.root.winfo_screenwidth()
@@ -365,27 +708,32 @@ class SystemMonitor:
         self.root.geometry(f"{width}x{height}+{x}+{y}")
 
     def create_display(self):
-        canvas_width = self.canvas.winfo_width() or 1400
-        canvas_height = self.canvas.winfo_height() or 800
-        
-        center_x = canvas_width // 2
-        center_y = canvas_height // 2
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        if canvas_width <= 1:  # Canvas not yet mapped; the first resize moves everything into place
+            canvas_width, canvas_height = 1400, 800
+        self.layout = self.compute_layout(canvas_width, canvas_height)
+        center_x = self.layout['center_x']
+        center_y = self.layout['center_y']
+        theme = Config.COLOR_SCHEMES[self.current_theme]
         
         # Clear previous widgets by reinitializing
         self.widgets = {
             'cpu': {}, 'ram': {}, 'gpu': {}, 'gpu_freq': {}, 'gpu_temp': {},
-            'cpu_temp': {}, 'fans': [], 'left_bar': {}, 'right_bar': {},
+            'cpu_temp': {}, 'fans': [], 'gpus': [], 'left_bar': {}, 'right_bar': {},
             'info': None, 'fps': None
         }
         
-        # System info at top
-        metrics = self.metrics_collector.get_cached_metrics()
-        gpu_mem_text = f"{metrics['gpu_memory_total']}MB" if metrics['gpu_memory_total'] > 0 else "No GPU"
+        # Items are tagged by what they are anchored to, so a resize can move them as groups:
+        # 'layout_top' follows the horizontal centre, 'layout_center' the canvas centre
+        # and 'layout_corner' the right edge. Role tags ('role_text', 'role_accent' for fills,
+        # 'role_accent_line' for outlines) let apply_theme recolour items in place.
         
+        # System info at top
         self.widgets['info'] = self.canvas.create_text(
             center_x, 30, 
-            text=f"CPU: {psutil.cpu_count()} Cores | RAM: {psutil.virtual_memory().total//(1024**3)}GB | GPU: {gpu_mem_text}", 
-            fill=Config.COLORS['text'], font=('Arial', 12), anchor='center'
+            text=self.info_text(), 
+            fill=theme['text'], font=('Arial', 12), anchor='center', tags=('layout_top', 'role_text')
         )
         
         # Left vertical bar - CPU Frequency (existing)
@@ -394,87 +742,98 @@ class SystemMonitor:
         bar_bottom = 150 + bar_height
         
         self.canvas.create_text(left_bar_x, 100, text="CPU Frequency", 
-                               fill=Config.COLORS['text'], font=('Arial', 10), anchor='center')
+                               fill=theme['text'], font=('Arial', 10), anchor='center',
+                               tags=('layout_top', 'role_text'))
         
         self.widgets['left_bar']['bg'] = self.canvas.create_rectangle(
             left_bar_x - 10, 150, 
             left_bar_x + 10, bar_bottom, 
-            outline='#333', fill='#333'
+            outline='#333', fill='#333', tags='layout_top'
         )
         self.widgets['left_bar']['fill'] = self.canvas.create_rectangle(
             left_bar_x - 10, bar_bottom, 
             left_bar_x + 10, bar_bottom, 
-            fill=Config.COLORS['frequency']
+            fill=Config.COLORS['frequency'], tags='layout_top'
         )
         self.widgets['left_bar']['text'] = self.canvas.create_text(
             left_bar_x, bar_bottom + 20, 
-            text="0.0 GHz", fill=Config.COLORS['text'], font=('Arial', 9)
+            text="0.0 GHz", fill=theme['text'], font=('Arial', 9), tags=('layout_top', 'role_text')
         )
         
         # Right vertical bar - CPU Usage (existing)
         right_bar_x = center_x + 400
         
         self.canvas.create_text(right_bar_x, 100, text="CPU Usage", 
-                               fill=Config.COLORS['text'], font=('Arial', 10), anchor='center')
+                               fill=theme['text'], font=('Arial', 10), anchor='center',
+                               tags=('layout_top', 'role_text'))
         
         self.widgets['right_bar']['bg'] = self.canvas.create_rectangle(
             right_bar_x - 10, 150, 
             right_bar_x + 10, bar_bottom, 
-            outline='#333', fill='#333'
+            outline='#333', fill='#333', tags='layout_top'
         )
         self.widgets['right_bar']['fill'] = self.canvas.create_rectangle(
             right_bar_x - 10, bar_bottom, 
             right_bar_x + 10, bar_bottom, 
-            fill=Config.COLORS['cpu']
+            fill=theme['accent'], tags=('layout_top', 'role_accent')
         )
         self.widgets['right_bar']['text'] = self.canvas.create_text(
             right_bar_x, bar_bottom + 20, 
-            text="0%", fill=Config.COLORS['text'], font=('Arial', 9)
+            text="0%", fill=theme['text'], font=('Arial', 9), tags=('layout_top', 'role_text')
         )
         
         # Large CPU pie chart in center (existing)
         circle_radius = 100
         self.widgets['cpu']['bg'], self.widgets['cpu']['circle'], \
         self.widgets['cpu']['text'], self.widgets['cpu']['subtext'] = self.visualizer.draw_circle_meter(
-            center_x, center_y - 50, circle_radius, 0, Config.COLORS['cpu'],
-            text="CPU: 0%", subtext="0.0 GHz"
+            center_x, center_y - 50, circle_radius, 0, theme['accent'],
+            text="CPU: 0%", subtext="0.0 GHz", tags='layout_center',
+            text_color=theme['text'], accent=True
         )
         
         # CPU Temperature (below CPU)
         self.widgets['cpu_temp']['bg'], self.widgets['cpu_temp']['circle'], \
         self.widgets['cpu_temp']['text'], self.widgets['cpu_temp']['subtext'] = self.visualizer.draw_circle_meter(
             center_x, center_y + 120, 60, 0, Config.COLORS['temp'],
-            text="CPU Temp", subtext="0°C", width=6
+            text="CPU Temp", subtext="0°C", width=6, tags='layout_center',
+            text_color=theme['text']
         )
         
         # RAM Usage circle (left of CPU)
         self.widgets['ram']['bg'], self.widgets['ram']['circle'], \
         self.widgets['ram']['text'], self.widgets['ram']['subtext'] = self.visualizer.draw_circle_meter(
             center_x - 200, center_y - 50, 80, 0, Config.COLORS['ram'],
-            text="RAM: 0%", subtext="0/0 GB"
+            text="RAM: 0%", subtext="0/0 GB", tags='layout_center',
+            text_color=theme['text']
         )
         
         # GPU Usage circle (right of CPU)
         self.widgets['gpu']['bg'], self.widgets['gpu']['circle'], \
         self.widgets['gpu']['text'], self.widgets['gpu']['subtext'] = self.visualizer.draw_circle_meter(
             center_x + 200, center_y - 50, 80, 0, Config.COLORS['gpu'],
-            text="GPU: 0%", subtext="0/0 MB"
+            text="GPU: 0%", subtext="0/0 MB", tags='layout_center',
+            text_color=theme['text']
         )
         
         # GPU Frequency circle (below GPU)
         self.widgets['gpu_freq']['bg'], self.widgets['gpu_freq']['circle'], \
         self.widgets['gpu_freq']['text'], self.widgets['gpu_freq']['subtext'] = self.visualizer.draw_circle_meter(
             center_x + 200, center_y + 120, 60, 0, Config.COLORS['gpu_freq'],
-            text="GPU Freq", subtext="0 MHz", width=6
+            text="GPU Freq", subtext="0 MHz", width=6, tags='layout_center',
+            text_color=theme['text']
         )
         
         # Fan speeds (bottom row)
         self.create_fan_displays(center_x - 200, center_y + 220, 400)
         
+        # Per-device GPU rows along the left edge, hidden until several GPUs are found
+        self.create_gpu_panel(15, 60, Config.GPU_PANEL_ROWS)
+        
         # FPS counter
         self.widgets['fps'] = self.canvas.create_text(
             canvas_width - 50, 20, 
-            text="FPS: 0", fill=Config.COLORS['text'], font=('Arial', 8), anchor='ne'
+            text="FPS: 0", fill=theme['text'], font=('Arial', 8), anchor='ne', justify='right',
+            tags=('layout_corner', 'role_text')
         )
 
     def create_fan_displays(self, start_x, y, total_width):
@@ -488,7 +847,8 @@ class SystemMonitor:
             # Fan circle
             bg, circle, text, subtext = self.visualizer.draw_circle_meter(
                 fan_x, y, 50, 0, Config.COLORS['fan'],
-                text=f"Fan {i+1}", subtext="0 RPM", width=6
+                text=f"Fan {i+1}", subtext="0 RPM", width=6, tags='layout_center',
+                text_color=Config.COLOR_SCHEMES[self.current_theme]['text']
             )
             
             self.widgets['fans'].append({
@@ -496,28 +856,72 @@ class SystemMonitor:
                 'x': fan_x, 'y': y
             })
 
+    def create_gpu_panel(self, x, y, rows):
+        """Title plus one label and usage bar per GPU; rows stay hidden until update_gpu_panel shows them"""
+        theme = Config.COLOR_SCHEMES[self.current_theme]
+        self.widgets['gpu_panel_title'] = self.canvas.create_text(
+            x, y, text="GPUs", fill=theme['text'], font=('Arial', 10, 'bold'), anchor='w',
+            state=tk.HIDDEN, tags='role_text'
+        )
+        self.visualizer.remember(self.widgets['gpu_panel_title'], state=tk.HIDDEN)
+        
+        for i in range(rows):
+            row_y = y + 24 + i * 32
+            text = self.canvas.create_text(
+                x, row_y, text="", fill=theme['text'], font=('Arial', 8), anchor='w',
+                state=tk.HIDDEN, tags='role_text'
+            )
+            bar_bg = self.canvas.create_rectangle(
+                x, row_y + 9, x + 130, row_y + 15, outline='#333', fill='#333', state=tk.HIDDEN
+            )
+            bar_fill = self.canvas.create_rectangle(
+                x, row_y + 9, x, row_y + 15, outline='', fill=Config.COLORS['gpu'], state=tk.HIDDEN
+            )
+            for item_id in (text, bar_bg, bar_fill):
+                self.visualizer.remember(item_id, state=tk.HIDDEN)
+            self.widgets['gpus'].append({
+                'text': text, 'bar_bg': bar_bg, 'bar_fill': bar_fill,
+                'x': x, 'y': row_y + 9, 'width': 130
+            })
+
     def start_monitoring(self):
         self.monitoring_thread = threading.Thread(target=self.update_metrics_threaded, daemon=True)
         self.monitoring_thread.start()
+        # Tk is only touched from its own thread, once per clock frame
+        self.clock.add_task(lambda dt: self.mailbox.drain(self.update_metrics))
+        self.clock.add_task(self.update_perf_overlay, interval=Config.PERF_OVERLAY_INTERVAL)
+        self.clock.add_observer(self.instruments.record_frame)
+        self.clock.start()
 
     def update_metrics_threaded(self):
+        last_metrics = None
         while True:
-            self.update_metrics()
-            time.sleep(Config.UPDATE_INTERVAL / 1000)
+            try:
+                metrics = self.metrics_collector.get_cached_metrics()
+                if metrics is not last_metrics:
+                    self.mailbox.publish(metrics)
+                    last_metrics = metrics
+            except Exception as e:
+                self.logger.error(f"Error collecting metrics: {e}")
+            # Wake up when the next source is due rather than on a fixed tick
+            time.sleep(max(Config.MIN_POLL_INTERVAL, self.metrics_collector.time_until_next_sample()))
 
-    def update_metrics(self):
+    def update_metrics(self, metrics):
+        """Render the newest snapshot from the mailbox; runs on the Tk thread"""
         try:
-            metrics = self.metrics_collector.get_cached_metrics()
-            
             # Update window title with real stats
-            self.root.title(f"System Monitor - CPU: {metrics['cpu_percent']:.1f}% | RAM: {metrics['ram_percent']:.1f}% | GPU: {metrics['gpu_usage']:.1f}%")
-            
-            # Update FPS counter
-            self.canvas.itemconfig(self.widgets['fps'], text=f"FPS: {1}")
+            gpu_status = metrics.get('gpu_status', 'ready')
+            gpu_title = "probing" if gpu_status == PROBING else f"{metrics['gpu_usage']:.1f}%"
+            self.root.title(f"System Monitor - CPU: {metrics['cpu_percent']:.1f}% | RAM: {metrics['ram_percent']:.1f}% | GPU: {gpu_title}")
             
             # Update visual elements with real data
+            self.visualizer.configure(self.widgets['info'], text=self.info_text(metrics['gpu_memory_total'], gpu_status))
             self.update_visuals(metrics)
             
+            # Canvas redraws are idle handlers queued ahead of this one, so it runs once the pixels are out
+            if 'sample_time' in metrics:
+                self.root.after_idle(lambda: self.instruments.record_latency(time.time() - metrics['sample_time']))
+            
             # Check alerts
             alerts = self.alert_manager.check_thresholds(metrics)
             if alerts:
@@ -526,71 +930,93 @@ class SystemMonitor:
         except Exception as e:
             self.logger.error(f"Error updating metrics: {e}")
 
+    def update_perf_overlay(self, dt):
+        """Refresh the overlay in the 'fps' slot with frame, render, sensor and latency timings"""
+        scheduler = getattr(self.metrics_collector, 'scheduler', None)
+        if scheduler:
+            self.instruments.record_sources(scheduler.sources)
+        self.visualizer.configure(self.widgets['fps'], text=self.instruments.overlay_text())
+
     def update_visuals(self, metrics):
-        # Update existing CPU elements with real data
-        self.visualizer.update_circle(self.widgets['cpu']['circle'], metrics['cpu_percent'])
-        self.canvas.itemconfig(self.widgets['cpu']['text'], text=f"CPU: {metrics['cpu_percent']:.1f}%")
-        self.canvas.itemconfig(self.widgets['cpu']['subtext'], text=f"{metrics['cpu_freq']:.1f} GHz")
-        
-        # Update CPU temperature
-        cpu_temp_percent = min(metrics['cpu_temp'], 100)  # Cap at 100% for display
-        self.visualizer.update_circle(self.widgets['cpu_temp']['circle'], cpu_temp_percent)
-        self.canvas.itemconfig(self.widgets['cpu_temp']['subtext'], text=f"{metrics['cpu_temp']:.1f}°C")
+        # Each widget group is timed separately for the perf overlay
+        with self.instruments.measure('cpu'):
+            # Update existing CPU elements with real data
+            self.visualizer.update_circle(self.widgets['cpu']['circle'], metrics['cpu_percent'])
+            self.visualizer.configure(self.widgets['cpu']['text'], text=f"CPU: {metrics['cpu_percent']:.1f}%")
+            self.visualizer.configure(self.widgets['cpu']['subtext'], text=f"{metrics['cpu_freq']:.1f} GHz")
         
-        # Update existing vertical bars with real data
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
+            # Update CPU temperature
+            cpu_temp_percent = min(metrics['cpu_temp'], 100)  # Cap at 100% for display
+            self.visualizer.update_circle(self.widgets['cpu_temp']['circle'], cpu_temp_percent)
+            self.visualizer.configure(self.widgets['cpu_temp']['subtext'], text=f"{metrics['cpu_temp']:.1f}°C")
         
-        if canvas_width > 50 and canvas_height > 50:
-            center_x = canvas_width // 2
-            bar_height = 350
-            bar_bottom = 150 + bar_height
+        with self.instruments.measure('bars'):
+            # Update existing vertical bars with real data
+            if self.layout['width'] > 50 and self.layout['height'] > 50:
+                center_x = self.layout['center_x']
+                bar_height = 350
+                bar_bottom = 150 + bar_height
             
-            left_bar_x = center_x - 400
-            right_bar_x = center_x + 400
+                left_bar_x = center_x - 400
+                right_bar_x = center_x + 400
             
-            # Left vertical - CPU Frequency (real data)
-            max_freq = metrics['cpu_max_freq'] or 4000
-            freq_percent = (metrics['cpu_freq'] / max_freq) * 100
-            freq_height = (freq_percent / 100) * bar_height
+                # Left vertical - CPU Frequency (real data)
+                max_freq = metrics['cpu_max_freq'] or 4000
+                freq_percent = (metrics['cpu_freq'] / max_freq) * 100
+                freq_height = (freq_percent / 100) * bar_height
             
-            self.canvas.coords(
-                self.widgets['left_bar']['fill'], 
-                left_bar_x - 10, bar_bottom - freq_height, 
-                left_bar_x + 10, bar_bottom
-            )
-            self.canvas.itemconfig(self.widgets['left_bar']['text'], text=f"{metrics['cpu_freq']:.1f} GHz")
+                self.visualizer.set_coords(
+                    self.widgets['left_bar']['fill'], 
+                    left_bar_x - 10, bar_bottom - freq_height, 
+                    left_bar_x + 10, bar_bottom
+                )
+                self.visualizer.configure(self.widgets['left_bar']['text'], text=f"{metrics['cpu_freq']:.1f} GHz")
             
-            # Right vertical - CPU Usage (real data)
-            usage_height = (metrics['cpu_percent'] / 100) * bar_height
-            self.canvas.coords(
-                self.widgets['right_bar']['fill'], 
-                right_bar_x - 10, bar_bottom - usage_height, 
-                right_bar_x + 10, bar_bottom
-            )
-            self.canvas.itemconfig(self.widgets['right_bar']['text'], text=f"{metrics['cpu_percent']:.1f}%")
-        
-        # Update RAM circle with real data
-        self.visualizer.update_circle(self.widgets['ram']['circle'], metrics['ram_percent'])
-        self.canvas.itemconfig(self.widgets['ram']['text'], text=f"RAM: {metrics['ram_percent']:.1f}%")
-        self.canvas.itemconfig(self.widgets['ram']['subtext'], text=f"{metrics['ram_used']}/{metrics['ram_total']} GB")
-        
-        # Update GPU circle with real data
-        self.visualizer.update_circle(self.widgets['gpu']['circle'], metrics['gpu_usage'])
-        self.canvas.itemconfig(self.widgets['gpu']['text'], text=f"GPU: {metrics['gpu_usage']:.1f}%")
-        self.canvas.itemconfig(self.widgets['gpu']['subtext'], text=f"{metrics['gpu_memory_used']}/{metrics['gpu_memory_total']} MB")
-        
-        # Update GPU Frequency circle with real data
-        if metrics['gpu_frequency'] > 0:
-            gpu_freq_percent = (metrics['gpu_frequency'] / 2000) * 100  # Assuming 2000 MHz max for visualization
-            self.visualizer.update_circle(self.widgets['gpu_freq']['circle'], gpu_freq_percent)
-            self.canvas.itemconfig(self.widgets['gpu_freq']['subtext'], text=f"{metrics['gpu_frequency']} MHz")
-        else:
-            self.visualizer.update_circle(self.widgets['gpu_freq']['circle'], 0)
-            self.canvas.itemconfig(self.widgets['gpu_freq']['subtext'], text="N/A")
+                # Right vertical - CPU Usage (real data)
+                usage_height = (metrics['cpu_percent'] / 100) * bar_height
+                self.visualizer.set_coords(
+                    self.widgets['right_bar']['fill'], 
+                    right_bar_x - 10, bar_bottom - usage_height, 
+                    right_bar_x + 10, bar_bottom
+                )
+                self.visualizer.configure(self.widgets['right_bar']['text'], text=f"{metrics['cpu_percent']:.1f}%")
+        
+        with self.instruments.measure('ram'):
+            # Update RAM circle with real data
+            self.visualizer.update_circle(self.widgets['ram']['circle'], metrics['ram_percent'])
+            self.visualizer.configure(self.widgets['ram']['text'], text=f"RAM: {metrics['ram_percent']:.1f}%")
+            self.visualizer.configure(self.widgets['ram']['subtext'], text=f"{metrics['ram_used']}/{metrics['ram_total']} GB")
         
-        # Update Fan speeds with real data
-        self.update_fan_displays(metrics['fan_speeds'])
+        with self.instruments.measure('gpu'):
+            # Drivers are still initialising in the background
+            if metrics.get('gpu_status') == PROBING:
+                self.visualizer.update_circle(self.widgets['gpu']['circle'], 0)
+                self.visualizer.configure(self.widgets['gpu']['text'], text="GPU")
+                self.visualizer.configure(self.widgets['gpu']['subtext'], text="probing...")
+                self.visualizer.update_circle(self.widgets['gpu_freq']['circle'], 0)
+                self.visualizer.configure(self.widgets['gpu_freq']['subtext'], text="probing...")
+            else:
+                # Update GPU circle with real data
+                self.visualizer.update_circle(self.widgets['gpu']['circle'], metrics['gpu_usage'])
+                self.visualizer.configure(self.widgets['gpu']['text'], text=f"GPU: {metrics['gpu_usage']:.1f}%")
+                self.visualizer.configure(self.widgets['gpu']['subtext'], text=f"{metrics['gpu_memory_used']}/{metrics['gpu_memory_total']} MB")
+            
+                # Update GPU Frequency circle with real data
+                if metrics['gpu_frequency'] > 0:
+                    gpu_freq_percent = (metrics['gpu_frequency'] / 2000) * 100  # Assuming 2000 MHz max for visualization
+                    self.visualizer.update_circle(self.widgets['gpu_freq']['circle'], gpu_freq_percent)
+                    self.visualizer.configure(self.widgets['gpu_freq']['subtext'], text=f"{metrics['gpu_frequency']} MHz")
+                else:
+                    self.visualizer.update_circle(self.widgets['gpu_freq']['circle'], 0)
+                    self.visualizer.configure(self.widgets['gpu_freq']['subtext'], text="N/A")
+        
+            # One row per device when there is more than one
+            gpus = metrics.get('gpus', [])
+            self.update_gpu_panel(gpus if len(gpus) > 1 else [])
+        
+        with self.instruments.measure('fans'):
+            # Update Fan speeds with real data
+            self.update_fan_displays(metrics['fan_speeds'])
 
     def update_fan_displays(self, fan_speeds):
         """Update fan speed displays with real fan data"""
@@ -604,39 +1030,70 @@ class SystemMonitor:
                 fan_percent = (fan['speed'] / max_fan_speed) * 100 if fan['speed'] > 0 else 0
                 
                 self.visualizer.update_circle(fan_widget['circle'], fan_percent)
-                self.canvas.itemconfig(fan_widget['text'], text=fan['name'])
-                self.canvas.itemconfig(fan_widget['subtext'], text=f"{fan['speed']} RPM")
+                self.visualizer.configure(fan_widget['text'], text=fan['name'])
+                self.visualizer.configure(fan_widget['subtext'], text=f"{fan['speed']} RPM")
                 
                 # Make sure it's visible
-                self.canvas.itemconfig(fan_widget['bg'], state=tk.NORMAL)
-                self.canvas.itemconfig(fan_widget['circle'], state=tk.NORMAL)
-                self.canvas.itemconfig(fan_widget['text'], state=tk.NORMAL)
-                self.canvas.itemconfig(fan_widget['subtext'], state=tk.NORMAL)
+                self.visualizer.set_state(self.fan_items(fan_widget), tk.NORMAL)
             else:
                 # Hide unused fan slots
-                self.canvas.itemconfig(fan_widget['bg'], state=tk.HIDDEN)
-                self.canvas.itemconfig(fan_widget['circle'], state=tk.HIDDEN)
-                self.canvas.itemconfig(fan_widget['text'], state=tk.HIDDEN)
-                self.canvas.itemconfig(fan_widget['subtext'], state=tk.HIDDEN)
+                self.visualizer.set_state(self.fan_items(fan_widget), tk.HIDDEN)
+    
+    def update_gpu_panel(self, gpus):
+        """Show a row per GPU in `gpus` and hide the rest of the pool"""
+        state = tk.NORMAL if gpus else tk.HIDDEN
+        self.visualizer.configure(self.widgets['gpu_panel_title'], state=state)
+        
+        for i, row in enumerate(self.widgets['gpus']):
+            items = (row['text'], row['bar_bg'], row['bar_fill'])
+            if i >= len(gpus):
+                self.visualizer.set_state(items, tk.HIDDEN)
+                continue
+            gpu = gpus[i]
+            memory = f"{gpu['gpu_memory_used'] / 1024:.1f}/{gpu['gpu_memory_total'] / 1024:.1f}G"
+            self.visualizer.configure(
+                row['text'],
+                text=f"GPU{gpu['index']}  {gpu['gpu_usage']:.0f}%  {gpu['gpu_temperature']:.0f}°C  {memory}"
+            )
+            fill_width = row['width'] * min(gpu['gpu_usage'], 100) / 100
+            self.visualizer.set_coords(row['bar_fill'], row['x'], row['y'], row['x'] + fill_width, row['y'] + 6)
+            self.visualizer.set_state(items, tk.NORMAL)
+    
+    def fan_items(self, fan_widget):
+        return fan_widget['bg'], fan_widget['circle'], fan_widget['text'], fan_widget['subtext']
 
     def handle_alerts(self, alerts):
         for level, message in alerts:
             self.logger.warning(f"{level}: {message}")
 
     def on_resize(self, event):
-        if event.widget == self.root:
-            current_width = self.root.winfo_width()
-            current_height = self.root.winfo_height()
-            
-            if (abs(current_width - self.last_width) > 50 or 
-                abs(current_height - self.last_height) > 50):
-                self.last_width = current_width
-                self.last_height = current_height
-                self.root.after(100, self.reposition_widgets)
+        if event.widget == self.root and self.relayout_pending is None:
+            # One relayout per burst of Configure events
+            self.relayout_pending = self.root.after_idle(self.reposition_widgets)
+
+    def compute_layout(self, width, height):
+        """Anchor points every item position is derived from"""
+        return {'width': width, 'height': height, 'center_x': width // 2, 'center_y': height // 2}
 
     def reposition_widgets(self):
-        self.canvas.delete("all")
-        self.create_display()
+        """Move existing items to the new canvas size; nothing is recreated or re-read"""
+        self.relayout_pending = None
+        layout = self.compute_layout(self.canvas.winfo_width(), self.canvas.winfo_height())
+        if self.layout is None or layout['width'] <= 1:
+            return
+        
+        dx = layout['center_x'] - self.layout['center_x']
+        dy = layout['center_y'] - self.layout['center_y']
+        if dx or dy:
+            self.canvas.move('layout_top', dx, 0)
+            self.canvas.move('layout_center', dx, dy)
+            for fan_widget in self.widgets['fans']:
+                fan_widget['x'] += dx
+                fan_widget['y'] += dy
+        corner_dx = layout['width'] - self.layout['width']
+        if corner_dx:
+            self.canvas.move('layout_corner', corner_dx, 0)
+        self.layout = layout
 
     def toggle_theme(self):
         themes = list(Config.COLOR_SCHEMES.keys())
@@ -649,26 +1106,66 @@ class SystemMonitor:
         theme = Config.COLOR_SCHEMES[theme_name]
         self.root.configure(bg=theme['bg'])
         self.canvas.configure(bg=theme['bg'])
-        self.reposition_widgets()
+        
+        # Recolour by role; items, their live values and history stay as they are
+        self.canvas.itemconfig('role_text', fill=theme['text'])
+        self.canvas.itemconfig('role_accent', fill=theme['accent'])
+        self.canvas.itemconfig('role_accent_line', outline=theme['accent'])
 
     def export_stats(self):
+        """Stream the last Config.EXPORT_RANGE seconds of history to a file in the background"""
+        if self.export_job and self.export_job.is_alive():
+            self.logger.info("Export already running")
+            return
+
         try:
-            metrics = self.metrics_collector.get_cached_metrics()
-            filename = f"system_stats_{time.strftime('%Y%m%d_%H%M%S')}.txt"
-            with open(filename, 'w') as f:
-                f.write(f"System Monitor Export - {time.ctime()}\n")
-                f.write(f"CPU Usage: {metrics['cpu_percent']:.1f}%\n")
-                f.write(f"CPU Frequency: {metrics['cpu_freq']:.1f} GHz\n")
-                f.write(f"CPU Temperature: {metrics['cpu_temp']:.1f}°C\n")
-                f.write(f"RAM Usage: {metrics['ram_percent']:.1f}%\n")
-                f.write(f"GPU Usage: {metrics['gpu_usage']:.1f}%\n")
-                f.write(f"GPU Frequency: {metrics['gpu_frequency']} MHz\n")
-                f.write(f"GPU Memory: {metrics['gpu_memory_used']}/{metrics['gpu_memory_total']} MB\n")
-                f.write(f"Fan Speeds: {[fan['speed'] for fan in metrics['fan_speeds']]} RPM\n")
-            self.logger.info(f"Stats exported to {filename}")
-        except Exception as e:
+            store = getattr(self.metrics_collector, 'store', None)
+            if store is None:
+                # History is owned by the collector daemon; read its store
+                store = TieredStore(Config.TSDB_DIR, RECORD_FIELDS, Config.TSDB_TIERS, readonly=True)
+
+            end = time.time()
+            start = end - Config.EXPORT_RANGE
+            tier = store.choose_tier(start, end)
+            filename = export_filename(f"system_stats_{time.strftime('%Y%m%d_%H%M%S')}",
+                                       Config.EXPORT_FORMAT, Config.EXPORT_GZIP)
+
+            self.export_job = ExportJob(tier['store'], filename, start, end, Config.EXPORT_FORMAT,
+                                        Config.EXPORT_GZIP, on_done=self.on_export_done)
+            self.export_job.start()
+            self.logger.info(f"Exporting {tier['name']} history to {filename}")
+        except (OSError, ValueError) as e:
             self.logger.error(f"Export failed: {e}")
 
+    def export_perf_report(self):
+        """Write the instrumentation snapshot, plus UI update counters, to a JSON file"""
+        filename = f"perf_report_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        extra = {
+            'ui_mailbox': self.mailbox.stats(),
+            'canvas_updates': {
+                'issued': self.visualizer.updates_issued,
+                'suppressed': self.visualizer.updates_suppressed
+            }
+        }
+        try:
+            self.instruments.export(filename, extra)
+            self.logger.info(f"Perf report written to {filename}")
+        except OSError as e:
+            self.logger.error(f"Perf report failed: {e}")
+
+    def on_export_done(self, job):
+        # Runs on the export thread - only log here, never touch Tk
+        if job.error:
+            self.logger.error(f"Export failed: {job.error}")
+        else:
+            self.logger.info(f"Stats exported to {job.path} ({job.rows_written} rows)")
+
+    def on_closing(self):
+        self.clock.stop()
+        if hasattr(self.metrics_collector, 'close'):
+            self.metrics_collector.close()
+        self.root.destroy()
+
     def open_task_manager(self):
         import os
         try:
@@ -684,6 +1181,7 @@ class SystemMonitor:
 System Monitor Help:
 - F1: Show this help
 - F2: Toggle theme
+- F3: Write a perf report (frame, render, sensor and latency timings)
 - Resize: Auto-adjust layout
 
 Note: Install these for full GPU monitoring:
@@ -704,4 +1202,5 @@ pip install nvidia-ml-py
 if __name__ == "__main__":
     root = tk.Tk()
     app = SystemMonitor(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,103 @@
+import argparse
+import math
+import random
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# sysmon.py plots the last 60 one-second samples
+TIME_POINTS = list(range(-59, 1))
+
+def create_usage_figure(ylabel, time_points, data, style):
+    """Dark 0-100% usage chart over the last 60 seconds; returns (figure, axes, line)"""
+    fig = Figure(figsize=(6, 3), dpi=100, facecolor='#1e1e1e')
+    ax = fig.add_subplot(111)
+    ax.set_facecolor('#1e1e1e')
+    ax.tick_params(colors='white')
+    ax.set_ylabel(ylabel, color='white')
+    ax.set_xlabel('Time (s)', color='white')
+    ax.set_ylim(0, 100)
+    ax.set_xlim(-60, 0)
+    line, = ax.plot(time_points, data, style, linewidth=2)
+    return fig, ax, line
+
+class BlitChart:
+    """Redraws only the line artist over a cached copy of the static axes"""
+    def __init__(self, figure_canvas, ax, line):
+        self.canvas = figure_canvas
+        self.ax = ax
+        self.line = line
+        self.background = None
+        
+        # Animated artists are left out of full draws; on_draw adds the line back
+        line.set_animated(True)
+        figure_canvas.mpl_connect('draw_event', self.on_draw)
+
+    def on_draw(self, event):
+        # Every full draw (first show, resize) refreshes the cached background
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+
+    def set_ydata(self, ydata):
+        self.line.set_ydata(ydata)
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
+def build_chart(style='r-'):
+    data = [0] * 60
+    fig, ax, line = create_usage_figure('CPU Usage (%)', TIME_POINTS, data, style)
+    return FigureCanvasAgg(fig), ax, line
+
+def sample_stream(frames):
+    """Rolling 60-sample windows of a noisy usage signal, one per frame"""
+    random.seed(0)
+    window = [0] * 60
+    for i in range(frames):
+        window.append(max(0, min(100, 40 + 30 * math.sin(i / 20) + random.gauss(0, 5))))
+        window.pop(0)
+        yield list(window)
+
+def time_full_redraw(frames):
+    """Previous update_graphs: set_data, relim, autoscale_view and a full figure draw"""
+    canvas, ax, line = build_chart()
+    canvas.draw()
+    start = time.perf_counter()
+    for data in sample_stream(frames):
+        line.set_data(TIME_POINTS, data)
+        ax.relim()
+        ax.autoscale_view()
+        canvas.draw()
+    return (time.perf_counter() - start) / frames * 1000
+
+def time_blit(frames):
+    """BlitChart: restore the cached axes background and draw only the line"""
+    canvas, ax, line = build_chart()
+    chart = BlitChart(canvas, ax, line)
+    chart.set_ydata([0] * 60)  # first update does the full draw that caches the background
+    start = time.perf_counter()
+    for data in sample_stream(frames):
+        chart.set_ydata(data)
+    return (time.perf_counter() - start) / frames * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="ms per chart frame: full matplotlib redraw vs blitting")
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    full_ms = time_full_redraw(args.frames)
+    blit_ms = time_blit(args.frames)
+
+    # Before: both figures redrawn every tick. After: only the visible tab's chart is blitted.
+    print("Offscreen Agg rendering; the Tk photo copy is not included")
+    print(f"{'path':<22} {'ms/chart':>10} {'ms/tick':>10}")
+    print(f"{'full redraw (before)':<22} {full_ms:>10.2f} {2 * full_ms:>10.2f}")
+    print(f"{'blit (after)':<22} {blit_ms:>10.2f} {blit_ms:>10.2f}")
+    print(f"speedup per tick: {2 * full_ms / blit_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import math
+import os
+import random
+import time
+
+import gorilla
+from tsdb import TimeSeriesStore
+
+def synthetic_session(samples):
+    """Slow-moving series shaped like a recorded dashboard session"""
+    random.seed(0)
+    start = time.time() - samples
+    timestamps = [start + i + random.choice([0, 0, 0, 0.001, -0.001]) for i in range(samples)]
+    columns = {
+        'cpu_percent': [round(abs(30 + 25 * math.sin(i / 300) + random.gauss(0, 5)), 1) for i in range(samples)],
+        'ram_percent': [round(45 + i / samples * 5, 1) for i in range(samples)],
+        'disk_percent': [62.3] * samples,
+        'cpu_freq': [random.choice([2400.0, 2400.0, 3600.0]) for _ in range(samples)],
+        'cpu_temp': [round(48 + 6 * math.sin(i / 600)) for i in range(samples)],
+        'fan_speed_0': [1800.0 + 100 * (i // 900 % 3) for i in range(samples)]
+    }
+    return timestamps, columns
+
+def recorded_session(directory):
+    """Raw samples from the on-disk store written by the dashboard"""
+    store = TimeSeriesStore(directory, [], readonly=True)
+    first = store.first_timestamp()
+    if first is None:
+        return None
+    columns = store.query(first, store.last_timestamp() + 1, store.stored_fields())
+    timestamps = [float(value) for value in columns.pop('timestamp')]
+    return timestamps, {field: [float(value) for value in values] for field, values in columns.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Gorilla encoding size and throughput")
+    parser.add_argument('--data-dir', default=os.path.join('metrics_data', 'raw'),
+                        help="raw tier directory of a recorded session")
+    parser.add_argument('--samples', type=int, default=3600, help="synthetic session length")
+    args = parser.parse_args()
+
+    session = recorded_session(args.data_dir) if os.path.isdir(args.data_dir) else None
+    source = args.data_dir
+    if session is None:
+        session = synthetic_session(args.samples)
+        source = f"synthetic ({args.samples} samples)"
+    timestamps, columns = session
+
+    values = len(timestamps) * len(columns)
+    raw_bytes = len(timestamps) * 8 * (len(columns) + 1)
+
+    start = time.perf_counter()
+    block = gorilla.encode_block(timestamps, columns)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in gorilla.iter_block(block):
+        pass
+    decode_time = time.perf_counter() - start
+
+    print(f"source:           {source}")
+    print(f"rows x fields:    {len(timestamps)} x {len(columns)}")
+    print(f"raw float64:      {raw_bytes} bytes ({raw_bytes / values:.2f} bytes/sample)")
+    print(f"gorilla:          {len(block)} bytes ({len(block) / values:.2f} bytes/sample, "
+          f"{raw_bytes / len(block):.1f}x smaller)")
+    print(f"encode:           {values / encode_time:,.0f} samples/s")
+    print(f"streaming decode: {values / decode_time:,.0f} samples/s")
+
+    print("\nper field bytes/sample:")
+    ts_size = len(gorilla.encode_block(timestamps, {}))
+    print(f"  {'timestamp':<18} {ts_size / len(timestamps):.2f}")
+    for field, series in columns.items():
+        size = len(gorilla.encode_block(timestamps, {field: series})) - ts_size
+        print(f"  {field:<18} {size / len(series):.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from fake_nvml import FakeNvml
+from gpu_backends import NvmlBackend
+
+def time_ticks(device_count, ticks, latency, unsupported):
+    """NVML calls and milliseconds per GPU tick for `device_count` simulated devices"""
+    nvml = FakeNvml(device_count, unsupported=unsupported, latency=latency)
+    backend = NvmlBackend(nvml)
+    backend.read({})  # first tick drops readings the devices don't support
+    nvml.calls.clear()
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        backend.read({})
+    elapsed = time.perf_counter() - start
+    return sum(nvml.calls.values()) / ticks, elapsed / ticks * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="NVML calls and time per GPU tick as the device count grows")
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--latency-us', type=float, default=20, help="simulated driver time per NVML call")
+    parser.add_argument('--no-fan', action='store_true', help="devices report fan speed as unsupported")
+    args = parser.parse_args()
+
+    unsupported = {'nvmlDeviceGetFanSpeed'} if args.no_fan else set()
+    print(f"FakeNvml, {args.latency_us:g}us per call")
+    print(f"{'devices':>8} {'calls/tick':>11} {'calls/device':>13} {'ms/tick':>9} {'ms/device':>10}")
+    for device_count in (1, 2, 4, 8):
+        calls, ms = time_ticks(device_count, args.ticks, args.latency_us / 1e6, unsupported)
+        print(f"{device_count:>8} {calls:>11.1f} {calls / device_count:>13.1f} {ms:>9.3f} {ms / device_count:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+from JustPracPerfectsome4 import Config, MetricsCollector
+from procfs_backend import ProcfsBackend
+
+def time_readers(readers, ticks):
+    """Return average microseconds per tick for each reader"""
+    results = {}
+    for name, read_func in readers.items():
+        read_func()  # warm up (first cpu_percent call primes the counters)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            read_func()
+        results[name] = (time.perf_counter() - start) / ticks * 1e6
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tick cost of psutil vs procfs/sysfs readers")
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--proc-root', default='/proc')
+    parser.add_argument('--sys-root', default='/sys')
+    args = parser.parse_args()
+
+    # Only the psutil readers are timed; keep the collector from opening the history
+    # store and the /metrics port (the GPU probe is closed with it)
+    Config.TSDB_ENABLED = False
+    Config.PROMETHEUS_ENABLED = False
+    psutil_collector = MetricsCollector(use_procfs=False)
+    # On Linux the collector maps hwmon for temperatures and fans; time psutil's own walk instead
+    if psutil_collector.sensors:
+        psutil_collector.sensors.close()
+        psutil_collector.sensors = None
+    backend = None
+    try:
+        backend = ProcfsBackend(args.proc_root, args.sys_root)
+        # Only sources the backend actually serves (GPU stays on NVML/GPUtil either way,
+        # and cpu_temp/fans drop out when no hwmon input was found)
+        sources = backend.sources
+        psutil_readers = {name: getattr(psutil_collector, f'read_{name}') for name in sources}
+        procfs_readers = {name: getattr(backend, f'read_{name}') for name in sources}
+
+        psutil_times = time_readers(psutil_readers, args.ticks)
+        procfs_times = time_readers(procfs_readers, args.ticks)
+    finally:
+        psutil_collector.close()
+        if backend:
+            backend.close()
+
+    print(f"{'source':<10} {'psutil us':>12} {'procfs us':>12} {'speedup':>9}")
+    for name in sources:
+        speedup = psutil_times[name] / procfs_times[name] if procfs_times[name] else 0
+        print(f"{name:<10} {psutil_times[name]:>12.1f} {procfs_times[name]:>12.1f} {speedup:>8.1f}x")
+
+    psutil_total = sum(psutil_times.values())
+    procfs_total = sum(procfs_times.values())
+    print(f"{'tick':<10} {psutil_total:>12.1f} {procfs_total:>12.1f} {psutil_total / procfs_total:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Chart stacks sysmon.py can start with; each is imported in a fresh interpreter
+STACKS = {
+    'tkinter only': "import tkinter",
+    'tk_chart': "import tkinter; import tk_chart",
+    'matplotlib': "import tkinter; import matplotlib.figure; import matplotlib.backends.backend_tkagg",
+}
+
+PROBE = """
+import resource, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def measure(imports, runs):
+    """Median import time (ms) and max RSS (KB) over `runs` cold interpreters, or None if it fails"""
+    times = []
+    rss = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', PROBE.format(imports=imports)],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        elapsed_ms, max_rss = result.stdout.split()
+        times.append(float(elapsed_ms))
+        rss.append(int(max_rss))
+    return statistics.median(times), statistics.median(rss)
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup import time and RSS of the sysmon.py chart stacks")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'stack':<14} {'import ms':>10} {'max RSS MB':>11}")
+    for name, imports in STACKS.items():
+        result = measure(imports, args.runs)
+        if result is None:
+            print(f"{name:<14} {'not installed':>22}")
+            continue
+        elapsed_ms, max_rss = result
+        print(f"{name:<14} {elapsed_ms:>10.1f} {max_rss / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import os
+import struct
+import time
+import signal
+import logging
+from types import SimpleNamespace
+from multiprocessing import shared_memory, resource_tracker
+
+from history_store import HistoryStore
+
+# Shared memory segment the daemon publishes into and dashboards attach to
+SHM_NAME = 'sysmon_metrics'
+RING_CAPACITY = 600
+
+# Fan slots stored per record (the dashboard shows up to 4 fans)
+MAX_FANS = 4
+
+# Fixed record layout: every field is a float64, in this order
+RECORD_FIELDS = [
+    'cpu_percent', 'cpu_freq', 'cpu_max_freq', 'cpu_temp',
+    'ram_percent', 'ram_used', 'ram_total', 'ram_used_bytes', 'ram_total_bytes',
+    'disk_percent', 'disk_used', 'disk_total', 'disk_used_bytes', 'disk_total_bytes',
+    'vram_percent',
+    'gpu_usage', 'gpu_frequency', 'gpu_memory_used', 'gpu_memory_total',
+    'gpu_temperature', 'gpu_fan_speed',
+    'fan_count'
+] + [f'fan_speed_{i}' for i in range(MAX_FANS)] + [
+    'net_bytes_sent', 'net_bytes_recv'
+]
+
+# Percentages and temperatures fit float32 in the history ring; byte totals and counters need float64
+COMPACT_FIELDS = [
+    'cpu_percent', 'cpu_temp', 'ram_percent', 'disk_percent', 'vram_percent',
+    'gpu_usage', 'gpu_temperature', 'gpu_fan_speed'
+]
+
+# Header: magic, version, capacity, field count, records written, writer pid
+HEADER_FORMAT = '<8sIIIQI'
+HEADER_SIZE = 64
+MAGIC = b'SYSMONRB'
+VERSION = 2
+WRITE_SEQ_OFFSET = struct.calcsize('<8sIII')
+
+# A reader treats the ring as abandoned once write_seq has not moved for this long (seconds)
+STALE_AFTER = 5.0
+
+logger = logging.getLogger('SystemMonitor')
+
+def pid_alive(pid):
+    if os.name == 'nt':
+        # Windows frees a segment with its last handle, so an existing one has a live owner
+        return True
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def ring_owner(shm):
+    """pid of the writer recorded in a segment's header, or 0 if the layout is not ours"""
+    magic, version, _, _, _, pid = struct.unpack_from(HEADER_FORMAT, shm.buf, 0)
+    return pid if magic == MAGIC and version == VERSION else 0
+
+# Record: sequence number, timestamp, then one value per field
+RECORD_FORMAT = '<' + 'd' * (len(RECORD_FIELDS) + 2)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+def flatten_metrics(metrics):
+    """Map a MetricsCollector dict onto the fixed record field order"""
+    values = dict(metrics)
+    fan_speeds = metrics.get('fan_speeds', [])
+    for i in range(MAX_FANS):
+        values[f'fan_speed_{i}'] = fan_speeds[i]['speed'] if i < len(fan_speeds) else 0
+    return [float(values.get(field) or 0) for field in RECORD_FIELDS]
+
+class RingWriter:
+    """Single writer that appends fixed-width samples into shared memory"""
+    def __init__(self, name=SHM_NAME, capacity=RING_CAPACITY):
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            existing = shared_memory.SharedMemory(name=name)
+            owner = ring_owner(existing)
+            if owner and pid_alive(owner):
+                existing.close()
+                raise RuntimeError(f"Collector already running (pid {owner})")
+            # Left behind by a collector that did not shut down cleanly
+            existing.close()
+            existing.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.capacity = capacity
+        self.write_seq = 0
+        struct.pack_into(HEADER_FORMAT, self.shm.buf, 0, MAGIC, VERSION, capacity, len(RECORD_FIELDS), 0,
+                         os.getpid())
+
+    def write(self, timestamp, values):
+        seq = self.write_seq + 1
+        offset = HEADER_SIZE + ((seq - 1) % self.capacity) * RECORD_SIZE
+
+        # Mark the slot as in-progress, fill it, then publish the sequence
+        struct.pack_into('<d', self.shm.buf, offset, 0)
+        struct.pack_into(RECORD_FORMAT, self.shm.buf, offset, 0, timestamp, *values)
+        struct.pack_into('<d', self.shm.buf, offset, seq)
+        struct.pack_into('<Q', self.shm.buf, WRITE_SEQ_OFFSET, seq)
+        self.write_seq = seq
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class RingReader:
+    """Zero-copy reader attached to the collector's shared-memory ring"""
+    def __init__(self, shm):
+        self.shm = shm
+        magic, version, capacity, field_count, _, pid = struct.unpack_from(HEADER_FORMAT, shm.buf, 0)
+        if magic != MAGIC or version != VERSION or field_count != len(RECORD_FIELDS):
+            shm.close()
+            raise ValueError("Shared memory segment has an unexpected layout")
+        self.capacity = capacity
+        self.writer_pid = pid
+        self.last_seq = self.write_seq
+        self.last_advance = time.monotonic()
+
+    @classmethod
+    def attach(cls, name=SHM_NAME):
+        """Attach to a running collector, or return None if there is none"""
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return None
+        # Readers must not unlink the collector's segment when they exit
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        try:
+            reader = cls(shm)
+        except ValueError:
+            return None
+        if not pid_alive(reader.writer_pid):
+            # Segment of a collector that crashed; nothing will ever be written to it
+            reader.close()
+            return None
+        return reader
+
+    def alive(self, now=None):
+        """False once the writer has exited or write_seq has stopped advancing"""
+        now = time.monotonic() if now is None else now
+        seq = self.write_seq
+        if seq != self.last_seq:
+            self.last_seq = seq
+            self.last_advance = now
+        return pid_alive(self.writer_pid) and now - self.last_advance < STALE_AFTER
+
+    @property
+    def write_seq(self):
+        return struct.unpack_from('<Q', self.shm.buf, WRITE_SEQ_OFFSET)[0]
+
+    def read(self, seq):
+        """Unpack one record, or None if it was overwritten while reading"""
+        if seq <= 0 or seq <= self.write_seq - self.capacity:
+            return None
+        offset = HEADER_SIZE + ((seq - 1) % self.capacity) * RECORD_SIZE
+        record = struct.unpack_from(RECORD_FORMAT, self.shm.buf, offset)
+        if record[0] != seq or struct.unpack_from('<d', self.shm.buf, offset)[0] != seq:
+            return None
+        return record
+
+    def latest(self):
+        """Latest sample as a dict with 'seq' and 'timestamp', or None"""
+        seq = self.write_seq
+        record = self.read(seq)
+        if record is None:
+            # The writer is mid-update; fall back to the previous slot
+            record = self.read(seq - 1)
+            if record is None:
+                return None
+
+        sample = dict(zip(RECORD_FIELDS, record[2:]))
+        sample['seq'] = int(record[0])
+        sample['timestamp'] = record[1]
+        return sample
+
+    def close(self):
+        self.shm.close()
+
+def refresh_feed(reader):
+    """`reader` while its collector is alive, else a reader on a restarted collector or None"""
+    if reader is None or reader.alive():
+        return reader
+    reader.close()
+    logger.warning("Collector daemon stopped publishing; re-attaching")
+    return RingReader.attach()
+
+class SharedMetricsCollector:
+    """Drop-in for MetricsCollector that reads samples from the collector daemon.
+
+    If the daemon goes away and no new one can be attached, `fallback()` is
+    called once to build a local collector that takes over.
+    """
+    def __init__(self, reader, history_size=60, retention=3600, resolution=1.0, fallback=None):
+        self.reader = reader
+        self.fallback = fallback
+        self.local = None
+        self.history_size = history_size
+        self.history_resolution = resolution
+        self.history = HistoryStore(RECORD_FIELDS, retention, COMPACT_FIELDS)
+        self.last_history_time = 0
+        self.last_seq = 0
+        self.cached_metrics = {}
+
+    @property
+    def scheduler(self):
+        return self.local.scheduler if self.local else None
+
+    def get_cached_metrics(self):
+        if self.local:
+            return self.local.get_cached_metrics()
+        
+        reader = refresh_feed(self.reader)
+        if reader is not self.reader:
+            self.reader = reader
+            self.last_seq = 0
+        if self.reader is None:
+            if self.fallback is None:
+                return self.cached_metrics or self._empty_metrics()
+            logger.warning("No collector daemon; polling sensors locally")
+            self.local = self.fallback()
+            return self.local.get_cached_metrics()
+        
+        sample = self.reader.latest()
+        if sample is None or sample['seq'] == self.last_seq:
+            return self.cached_metrics or self._empty_metrics()
+        self.last_seq = sample['seq']
+
+        fan_count = int(sample['fan_count'])
+        fan_speeds = [
+            {'name': f'Fan {i+1}', 'speed': int(sample[f'fan_speed_{i}'])}
+            for i in range(min(fan_count, MAX_FANS))
+        ] or [{'name': 'No Fan Data', 'speed': 0}]
+
+        if sample['timestamp'] - self.last_history_time >= self.history_resolution:
+            self.history.append(sample['timestamp'], [sample[field] for field in RECORD_FIELDS])
+            self.last_history_time = sample['timestamp']
+
+        metrics = {field: sample[field] for field in RECORD_FIELDS if not field.startswith('fan_')}
+        for field in ('ram_used', 'ram_total', 'disk_used', 'disk_total',
+                      'gpu_frequency', 'gpu_memory_used', 'gpu_memory_total'):
+            metrics[field] = int(metrics[field])
+        metrics['fan_speeds'] = fan_speeds
+        metrics['fan_count'] = len(fan_speeds)
+        metrics['sample_time'] = sample['timestamp']
+        metrics['cpu_history'] = self.history.view('cpu_percent', self.history_size)
+        metrics['ram_history'] = self.history.view('ram_percent', self.history_size)
+        self.cached_metrics = metrics
+        return metrics
+
+    def _empty_metrics(self):
+        metrics = {field: 0 for field in RECORD_FIELDS if not field.startswith('fan_')}
+        metrics['fan_speeds'] = [{'name': 'No Fan Data', 'speed': 0}]
+        metrics['fan_count'] = 1
+        metrics['cpu_history'] = self.history.view('cpu_percent', self.history_size)
+        metrics['ram_history'] = self.history.view('ram_percent', self.history_size)
+        return metrics
+
+    def time_until_next_sample(self):
+        if self.local:
+            return self.local.time_until_next_sample()
+        return 0.25
+
+    def close(self):
+        if self.local:
+            self.local.close()
+        if self.reader:
+            self.reader.close()
+
+def dashboard_sample(sample):
+    """Adapt a ring sample to the psutil-like objects the sysmon dashboards use"""
+    return SimpleNamespace(
+        timestamp=sample['timestamp'],
+        cpu_percent=sample['cpu_percent'],
+        cpu_freq=sample['cpu_freq'],
+        cpu_temp=sample['cpu_temp'],
+        memory=SimpleNamespace(
+            percent=sample['ram_percent'],
+            used=sample['ram_used_bytes'],
+            total=sample['ram_total_bytes']
+        ),
+        disk=SimpleNamespace(
+            percent=sample['disk_percent'],
+            used=sample['disk_used_bytes'],
+            total=sample['disk_total_bytes']
+        ),
+        net_io=SimpleNamespace(
+            bytes_sent=sample['net_bytes_sent'],
+            bytes_recv=sample['net_bytes_recv']
+        )
+    )
+
+def main():
+    import psutil
+    from JustPracPerfectsome4 import Config, MetricsCollector
+
+    # Claim the ring first; a second daemon must not start while the first is alive
+    try:
+        writer = RingWriter()
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+
+    collector = MetricsCollector()
+
+    def read_net():
+        net_io = psutil.net_io_counters()
+        return {'net_bytes_sent': net_io.bytes_sent, 'net_bytes_recv': net_io.bytes_recv}
+
+    collector.scheduler.register('net', read_net, Config.SOURCES['cpu']['interval'])
+
+    running = True
+
+    def stop(signum, frame):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Collector publishing to shared memory '{SHM_NAME}' ({RING_CAPACITY} records)")
+    if collector.endpoint:
+        print(f"Prometheus metrics at http://{Config.PROMETHEUS_HOST}:{Config.PROMETHEUS_PORT}/metrics")
+
+    try:
+        last_metrics = None
+        while running:
+            try:
+                metrics = collector.get_cached_metrics()
+                if metrics is not last_metrics:
+                    writer.write(time.time(), flatten_metrics(metrics))
+                    last_metrics = metrics
+            except Exception as e:
+                logger.error(f"Error collecting metrics: {e}")
+            time.sleep(max(Config.MIN_POLL_INTERVAL, collector.time_until_next_sample()))
+    finally:
+        writer.close()
+        collector.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import os
+import io
+import csv
+import gzip
+import json
+import math
+import shutil
+import struct
+import tempfile
+import threading
+import zipfile
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'npz')
+
+def export_filename(prefix, fmt, compress=False):
+    """File name for an export, e.g. system_stats_20251122_165000.csv.gz"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    suffix = '.gz' if compress and fmt != 'npz' else ''
+    return f"{prefix}.{fmt}{suffix}"
+
+def npy_header(count):
+    """NPY v1.0 header for a 1-D little-endian float64 array of `count` values"""
+    header = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }" % count
+    # Magic (6) + version (2) + length (2) + header must be a multiple of 64
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + ' ' * (padding % 64) + '\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1')
+
+class ExportJob(threading.Thread):
+    """Streams a time range of stored samples to CSV, JSON Lines or .npz off the UI thread.
+
+    `store` is a TimeSeriesStore (one tier of a TieredStore). The range is read
+    in `chunk_seconds` windows and written one chunk at a time.
+    """
+    def __init__(self, store, path, start, end, fmt='csv', compress=False, fields=None,
+                 chunk_seconds=600, on_done=None):
+        super().__init__(daemon=True)
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.store = store
+        self.path = path
+        self.start_time = start
+        self.end_time = end
+        self.fmt = fmt
+        self.compress = compress
+        self.fields = list(store.fields if fields is None else fields)
+        self.chunk_seconds = chunk_seconds
+        self.on_done = on_done
+
+        self.rows_written = 0
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def chunks(self):
+        """Yield (timestamps, {field: values}) for each window of the range"""
+        window_start = self.start_time
+        while window_start < self.end_time and not self.cancelled.is_set():
+            window_end = min(self.end_time, window_start + self.chunk_seconds)
+            columns = self.store.query(window_start, window_end, self.fields)
+            if len(columns['timestamp']):
+                yield columns['timestamp'], columns
+            window_start = window_end
+
+    def run(self):
+        try:
+            if self.fmt == 'csv':
+                self.write_csv()
+            elif self.fmt == 'jsonl':
+                self.write_jsonl()
+            else:
+                self.write_npz()
+        except (OSError, ValueError) as e:
+            self.error = e
+        if self.cancelled.is_set() and os.path.exists(self.path):
+            os.remove(self.path)
+        if self.on_done:
+            self.on_done(self)
+
+    def open_text(self):
+        if self.compress:
+            return gzip.open(self.path, 'wt', newline='')
+        return open(self.path, 'w', newline='')
+
+    def write_csv(self):
+        with self.open_text() as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp'] + self.fields)
+            for timestamps, columns in self.chunks():
+                buffer = io.StringIO()
+                chunk_writer = csv.writer(buffer)
+                chunk_writer.writerows(zip(timestamps, *(columns[field] for field in self.fields)))
+                f.write(buffer.getvalue())
+                self.rows_written += len(timestamps)
+
+    def write_jsonl(self):
+        with self.open_text() as f:
+            for timestamps, columns in self.chunks():
+                lines = []
+                for i, timestamp in enumerate(timestamps):
+                    row = {'timestamp': float(timestamp)}
+                    for field in self.fields:
+                        value = float(columns[field][i])
+                        row[field] = None if math.isnan(value) else value
+                    lines.append(json.dumps(row))
+                lines.append('')
+                f.write('\n'.join(lines))
+                self.rows_written += len(timestamps)
+
+    def write_npz(self):
+        """One .npy member per column; data is staged per column, then zipped"""
+        names = ['timestamp'] + self.fields
+        with tempfile.TemporaryDirectory() as staging:
+            staged = {name: open(os.path.join(staging, name), 'wb') for name in names}
+            try:
+                for timestamps, columns in self.chunks():
+                    for name in names:
+                        values = columns[name]
+                        staged[name].write(struct.pack(f'<{len(values)}d', *values))
+                    self.rows_written += len(timestamps)
+            finally:
+                for f in staged.values():
+                    f.close()
+
+            compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+            with zipfile.ZipFile(self.path, 'w', compression) as archive:
+                for name in names:
+                    with archive.open(f'{name}.npy', 'w', force_zip64=True) as member:
+                        member.write(npy_header(self.rows_written))
+                        with open(os.path.join(staging, name), 'rb') as f:
+                            shutil.copyfileobj(f, member)
@@ -0,0 +1,103 @@
+import math
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+class FakeNvmlError(Exception):
+    def __init__(self, value):
+        super().__init__(f"NVML error {value}")
+        self.value = value
+
+class FakeNvml:
+    """Stand-in for the pynvml module with `device_count` simulated GPUs.
+
+    Implements the calls gpu_backends.NvmlBackend makes and counts each one in
+    `calls`, so a GPU-less machine can run the dashboard and measure NVML round
+    trips per tick. Call names in `unsupported` raise NVML_ERROR_NOT_SUPPORTED,
+    like a fan query on a passively cooled board; `latency` adds a delay per call.
+    """
+    NVMLError = FakeNvmlError
+    NVML_SUCCESS = 0
+    NVML_ERROR_NOT_SUPPORTED = 3
+    NVML_CLOCK_GRAPHICS = 0
+    NVML_TEMPERATURE_GPU = 0
+    NVML_VALUE_TYPE_UNSIGNED_INT = 1
+    NVML_FI_DEV_MEMORY_TEMP = 82
+    NVML_FI_DEV_POWER_INSTANT = 186
+
+    def __init__(self, device_count=2, unsupported=(), latency=0):
+        self.device_count = device_count
+        self.unsupported = set(unsupported)
+        self.latency = latency
+        self.calls = Counter()
+        self.started = time.monotonic()
+
+    def _call(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if name in self.unsupported:
+            raise FakeNvmlError(self.NVML_ERROR_NOT_SUPPORTED)
+
+    def _wave(self, handle, period, low, high):
+        """Smoothly varying reading, out of phase between devices"""
+        t = time.monotonic() - self.started
+        return low + (high - low) * (0.5 + 0.5 * math.sin(t / period + handle))
+
+    def nvmlInit(self):
+        self._call('nvmlInit')
+
+    def nvmlShutdown(self):
+        self._call('nvmlShutdown')
+
+    def nvmlDeviceGetCount(self):
+        self._call('nvmlDeviceGetCount')
+        return self.device_count
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        self._call('nvmlDeviceGetHandleByIndex')
+        if not 0 <= index < self.device_count:
+            raise FakeNvmlError(2)  # NVML_ERROR_INVALID_ARGUMENT
+        return index
+
+    def nvmlDeviceGetName(self, handle):
+        self._call('nvmlDeviceGetName')
+        return f"Fake GPU {handle}"
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        self._call('nvmlDeviceGetMemoryInfo')
+        total = 8 * 1024 ** 3
+        return SimpleNamespace(total=total, used=int(self._wave(handle, 20, 0.1, 0.9) * total))
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        self._call('nvmlDeviceGetUtilizationRates')
+        return SimpleNamespace(gpu=int(self._wave(handle, 5, 0, 100)), memory=int(self._wave(handle, 7, 0, 100)))
+
+    def nvmlDeviceGetClockInfo(self, handle, clock_type):
+        self._call('nvmlDeviceGetClockInfo')
+        return int(self._wave(handle, 5, 300, 1900))
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        self._call('nvmlDeviceGetTemperature')
+        return int(self._wave(handle, 30, 35, 80))
+
+    def nvmlDeviceGetFanSpeed(self, handle):
+        self._call('nvmlDeviceGetFanSpeed')
+        return int(self._wave(handle, 30, 30, 90))
+
+    def nvmlDeviceGetFieldValues(self, handle, field_ids):
+        self._call('nvmlDeviceGetFieldValues')
+        readings = {
+            self.NVML_FI_DEV_POWER_INSTANT: int(self._wave(handle, 5, 30000, 250000)),  # mW
+            self.NVML_FI_DEV_MEMORY_TEMP: int(self._wave(handle, 30, 40, 90))
+        }
+        values = []
+        for field_id in field_ids:
+            supported = field_id in readings and field_id not in self.unsupported
+            values.append(SimpleNamespace(
+                fieldId=field_id,
+                nvmlReturn=self.NVML_SUCCESS if supported else self.NVML_ERROR_NOT_SUPPORTED,
+                valueType=self.NVML_VALUE_TYPE_UNSIGNED_INT,
+                value=SimpleNamespace(uiVal=readings.get(field_id, 0) if supported else 0)
+            ))
+        return values
@@ -0,0 +1,115 @@
+import logging
+import time
+
+logger = logging.getLogger('SystemMonitor')
+
+DEFAULT_FPS = 30
+
+# Longest dt handed to a task, so animations don't jump after a pause or a stall
+MAX_FRAME_DT = 0.25
+
+class FrameClock:
+    """One root.after loop that drives every animation and UI refresh task.
+
+    Tasks run on the Tk thread, either every frame or at most once per
+    `interval` seconds, and receive the seconds since they last ran. The clock
+    stops scheduling itself while the window is iconified or withdrawn.
+    """
+    def __init__(self, root, fps=DEFAULT_FPS):
+        self.root = root
+        self.tasks = []
+        self.after_id = None
+        self.running = False
+        self.paused = False
+        self.frames = 0
+        self.last_frame_start = None
+        self.observers = []
+        self.set_fps(fps)
+
+        root.bind('<Unmap>', self.on_unmap, add='+')
+        root.bind('<Map>', self.on_map, add='+')
+
+    def set_fps(self, fps):
+        self.fps = fps
+        self.frame_interval = 1.0 / fps
+
+    def add_task(self, callback, interval=None):
+        """Call `callback(dt)` every frame, or every `interval` seconds"""
+        task = {'callback': callback, 'interval': interval, 'last_run': None, 'next_due': 0}
+        self.tasks.append(task)
+        return task
+
+    def add_observer(self, callback):
+        """Call `callback(interval, duration)` after every frame; interval is None after a pause"""
+        self.observers.append(callback)
+
+    def remove_task(self, task):
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def start(self):
+        self.running = True
+        self.schedule(0)
+        return self
+
+    def stop(self):
+        self.running = False
+        self.cancel()
+
+    def schedule(self, delay):
+        if self.after_id is None and self.running and not self.paused:
+            self.after_id = self.root.after(max(1, int(delay * 1000)), self.tick)
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    # Pause while nothing is visible
+    def on_unmap(self, event):
+        if event.widget is self.root:
+            self.paused = True
+            self.last_frame_start = None
+            self.cancel()
+
+    def on_map(self, event):
+        if event.widget is self.root and self.paused:
+            self.paused = False
+            self.schedule(0)
+
+    def tick(self):
+        self.after_id = None
+        if not self.running or self.paused:
+            return
+
+        start = time.monotonic()
+        self.frames += 1
+        try:
+            self.run_tasks(start)
+        finally:
+            # Keep the target rate by subtracting the time this frame took
+            duration = time.monotonic() - start
+            self.schedule(self.frame_interval - duration)
+
+        interval = None if self.last_frame_start is None else start - self.last_frame_start
+        self.last_frame_start = start
+        for observer in self.observers:
+            observer(interval, duration)
+
+    def run_tasks(self, start):
+        for task in list(self.tasks):
+            interval = task['interval']
+            if interval:
+                # Due within half a frame counts as due, so periods don't round up a frame
+                if start < task['next_due'] - self.frame_interval / 2:
+                    continue
+                task['next_due'] = max(task['next_due'] + interval, start + interval / 2)
+
+            last_run = task['last_run']
+            dt = 0 if last_run is None else min(start - last_run, MAX_FRAME_DT)
+            task['last_run'] = start
+            # One failing task must not stop the others or the clock itself
+            try:
+                task['callback'](dt)
+            except Exception:
+                logger.exception(f"Frame task {task['callback']!r} failed")
@@ -0,0 +1,231 @@
+import json
+import struct
+
+# Timestamps are stored as integer milliseconds
+TIMESTAMP_SCALE = 1000
+
+# Delta-of-delta buckets: (control bits, control bit count, value bits)
+DOD_BUCKETS = [
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12)
+]
+DOD_FALLBACK_BITS = 32
+
+class BitWriter:
+    """Append-only bit stream, most significant bit first"""
+    def __init__(self):
+        self.buf = bytearray()
+        self.acc = 0
+        self.nbits = 0
+
+    def write(self, value, nbits):
+        self.acc = (self.acc << nbits) | (value & ((1 << nbits) - 1))
+        self.nbits += nbits
+        while self.nbits >= 8:
+            self.nbits -= 8
+            self.buf.append((self.acc >> self.nbits) & 0xFF)
+        self.acc &= (1 << self.nbits) - 1
+
+    def getvalue(self):
+        if self.nbits:
+            return bytes(self.buf) + bytes([(self.acc << (8 - self.nbits)) & 0xFF])
+        return bytes(self.buf)
+
+class BitReader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0  # bit position
+
+    def read(self, nbits):
+        value = 0
+        while nbits:
+            byte = self.data[self.pos >> 3]
+            offset = self.pos & 7
+            take = min(8 - offset, nbits)
+            bits = (byte >> (8 - offset - take)) & ((1 << take) - 1)
+            value = (value << take) | bits
+            self.pos += take
+            nbits -= take
+        return value
+
+    def read_bit(self):
+        bit = (self.data[self.pos >> 3] >> (7 - (self.pos & 7))) & 1
+        self.pos += 1
+        return bit
+
+def _signed(value, nbits):
+    return value - (1 << nbits) if value >= 1 << (nbits - 1) else value
+
+def _float_bits(value):
+    return struct.unpack('<Q', struct.pack('<d', value))[0]
+
+def _bits_float(bits):
+    return struct.unpack('<d', struct.pack('<Q', bits))[0]
+
+def _leading_zeros(value):
+    return 64 - value.bit_length()
+
+def _trailing_zeros(value):
+    return (value & -value).bit_length() - 1
+
+class TimestampEncoder:
+    """Delta-of-delta encoding of millisecond timestamps"""
+    def __init__(self):
+        self.writer = BitWriter()
+        self.count = 0
+        self.prev = 0
+        self.prev_delta = 0
+
+    def add(self, timestamp):
+        ts = int(round(timestamp * TIMESTAMP_SCALE))
+        if self.count == 0:
+            self.writer.write(ts, 64)
+        elif self.count == 1:
+            self.prev_delta = ts - self.prev
+            self.writer.write(self.prev_delta, 64)
+        else:
+            delta = ts - self.prev
+            dod = delta - self.prev_delta
+            self.prev_delta = delta
+            if dod == 0:
+                self.writer.write(0, 1)
+            else:
+                for control, control_bits, value_bits in DOD_BUCKETS:
+                    if -(1 << (value_bits - 1)) <= dod < 1 << (value_bits - 1):
+                        self.writer.write(control, control_bits)
+                        self.writer.write(dod, value_bits)
+                        break
+                else:
+                    self.writer.write(0b1111, 4)
+                    self.writer.write(dod, DOD_FALLBACK_BITS)
+        self.prev = ts
+        self.count += 1
+
+    def getvalue(self):
+        return self.writer.getvalue()
+
+class ValueEncoder:
+    """XOR compression of float64 values"""
+    def __init__(self):
+        self.writer = BitWriter()
+        self.count = 0
+        self.prev_bits = 0
+        self.prev_leading = 65
+        self.prev_trailing = 0
+
+    def add(self, value):
+        bits = _float_bits(value)
+        if self.count == 0:
+            self.writer.write(bits, 64)
+        else:
+            xor = bits ^ self.prev_bits
+            if xor == 0:
+                self.writer.write(0, 1)
+            else:
+                leading = min(_leading_zeros(xor), 31)
+                trailing = _trailing_zeros(xor)
+                if leading >= self.prev_leading and trailing >= self.prev_trailing:
+                    # Reuse the previous meaningful-bit window
+                    self.writer.write(0b10, 2)
+                    self.writer.write(xor >> self.prev_trailing, 64 - self.prev_leading - self.prev_trailing)
+                else:
+                    meaningful = 64 - leading - trailing
+                    self.writer.write(0b11, 2)
+                    self.writer.write(leading, 5)
+                    self.writer.write(meaningful & 0x3F, 6)  # 64 is stored as 0
+                    self.writer.write(xor >> trailing, meaningful)
+                    self.prev_leading = leading
+                    self.prev_trailing = trailing
+        self.prev_bits = bits
+        self.count += 1
+
+    def getvalue(self):
+        return self.writer.getvalue()
+
+def decode_timestamps(data, count):
+    """Streaming decoder: yields `count` timestamps in seconds"""
+    reader = BitReader(data)
+    ts = 0
+    delta = 0
+    for i in range(count):
+        if i == 0:
+            ts = reader.read(64)
+        elif i == 1:
+            delta = _signed(reader.read(64), 64)
+            ts += delta
+        else:
+            if reader.read_bit():
+                for _, control_bits, value_bits in DOD_BUCKETS:
+                    if not reader.read_bit():
+                        delta += _signed(reader.read(value_bits), value_bits)
+                        break
+                else:
+                    delta += _signed(reader.read(DOD_FALLBACK_BITS), DOD_FALLBACK_BITS)
+            ts += delta
+        yield ts / TIMESTAMP_SCALE
+
+def decode_values(data, count):
+    """Streaming decoder: yields `count` float64 values"""
+    reader = BitReader(data)
+    bits = 0
+    leading = 0
+    trailing = 0
+    for i in range(count):
+        if i == 0:
+            bits = reader.read(64)
+        elif reader.read_bit():
+            if reader.read_bit():
+                leading = reader.read(5)
+                meaningful = reader.read(6) or 64
+                trailing = 64 - leading - meaningful
+            bits ^= reader.read(64 - leading - trailing) << trailing
+        yield _bits_float(bits)
+
+# Block layout: '<I' count, '<I' header length, JSON header with field names
+# and stream lengths, then the timestamp stream and one value stream per field
+BLOCK_PREFIX_FORMAT = '<II'
+
+def encode_block(timestamps, columns):
+    """Compress a shared timestamp column plus named value columns into one block"""
+    ts_encoder = TimestampEncoder()
+    for timestamp in timestamps:
+        ts_encoder.add(float(timestamp))
+    streams = [ts_encoder.getvalue()]
+
+    fields = list(columns)
+    for field in fields:
+        encoder = ValueEncoder()
+        for value in columns[field]:
+            encoder.add(float(value))
+        streams.append(encoder.getvalue())
+
+    header = json.dumps({'fields': fields, 'lengths': [len(stream) for stream in streams]}).encode()
+    return struct.pack(BLOCK_PREFIX_FORMAT, len(timestamps), len(header)) + header + b''.join(streams)
+
+def block_streams(data):
+    """Split a block into (count, fields, timestamp stream, {field: value stream})"""
+    count, header_length = struct.unpack_from(BLOCK_PREFIX_FORMAT, data, 0)
+    offset = struct.calcsize(BLOCK_PREFIX_FORMAT)
+    header = json.loads(bytes(data[offset:offset + header_length]))
+    offset += header_length
+
+    streams = []
+    for length in header['lengths']:
+        streams.append(data[offset:offset + length])
+        offset += length
+    return count, header['fields'], streams[0], dict(zip(header['fields'], streams[1:]))
+
+def iter_block(data):
+    """Streaming decode of a block, one (timestamp, {field: value}) row at a time"""
+    count, fields, ts_stream, value_streams = block_streams(data)
+    decoders = [decode_values(value_streams[field], count) for field in fields]
+    for timestamp in decode_timestamps(ts_stream, count):
+        yield timestamp, {field: next(decoder) for field, decoder in zip(fields, decoders)}
+
+def decode_block(data, fields=None):
+    """Decode a whole block into (timestamps, {field: values}) lists"""
+    count, block_fields, ts_stream, value_streams = block_streams(data)
+    fields = block_fields if fields is None else fields
+    timestamps = list(decode_timestamps(ts_stream, count))
+    return timestamps, {field: list(decode_values(value_streams[field], count)) for field in fields}
@@ -0,0 +1,224 @@
+import importlib
+import logging
+import threading
+
+logger = logging.getLogger('SystemMonitor')
+
+# What the GPU source reports before (or without) a working backend
+EMPTY_GPU_METRICS = {
+    'gpu_usage': 0,
+    'gpu_frequency': 0,
+    'gpu_memory_used': 0,
+    'gpu_memory_total': 0,
+    'gpu_temperature': 0,
+    'gpu_fan_speed': 0,
+    'gpus': []
+}
+
+# Probe states, reported to the dashboard as metrics['gpu_status']
+PROBING = 'probing'
+READY = 'ready'
+UNAVAILABLE = 'unavailable'
+
+# Readings NVML exposes as field IDs: metric -> (pynvml constant, scale). They are fetched for each
+# device in one nvmlDeviceGetFieldValues call; constants the installed binding lacks are skipped.
+# NVML has no field ID for the current graphics clock, GPU temperature or fan speed, so those
+# stay in NvmlBackend.queries().
+NVML_FIELDS = [
+    ('gpu_power', 'NVML_FI_DEV_POWER_INSTANT', 0.001),  # mW -> W
+    ('gpu_memory_temperature', 'NVML_FI_DEV_MEMORY_TEMP', 1),
+]
+
+# nvmlValue_t union member for each nvmlValueType_t
+NVML_VALUE_MEMBERS = {0: 'dVal', 1: 'uiVal', 2: 'ulVal', 3: 'ullVal', 4: 'sllVal', 5: 'siVal'}
+
+# A device that fails one of these has no usable reading this tick
+NVML_REQUIRED = ('gpu_usage', 'gpu_memory_used')
+
+def device_metrics(index, name):
+    """Per-device entry of metrics['gpus']"""
+    metrics = {'index': index, 'name': name}
+    metrics.update((key, value) for key, value in EMPTY_GPU_METRICS.items() if key != 'gpus')
+    return metrics
+
+class NvmlBackend:
+    """NVIDIA GPUs through NVML (nvidia-ml-py), every device enumerated once.
+
+    `nvml` replaces the pynvml module, e.g. with fake_nvml.FakeNvml on machines
+    without a GPU.
+    """
+    name = 'nvml'
+    install_hint = 'pip install nvidia-ml-py'
+
+    def __init__(self, nvml=None):
+        self.pynvml = nvml if nvml is not None else importlib.import_module('pynvml')
+        self.pynvml.nvmlInit()
+        self.fields = [(metric, getattr(self.pynvml, constant), scale)
+                       for metric, constant, scale in NVML_FIELDS if hasattr(self.pynvml, constant)]
+        self.devices = [self.open_device(index) for index in range(self.pynvml.nvmlDeviceGetCount())]
+        if not self.devices:
+            self.pynvml.nvmlShutdown()
+            raise RuntimeError("NVML found no devices")
+
+    def open_device(self, index):
+        """Handle, name, memory size and the readings this device supports"""
+        pynvml = self.pynvml
+        handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+        name = pynvml.nvmlDeviceGetName(handle)
+        if isinstance(name, bytes):
+            name = name.decode()
+        return {
+            'index': index,
+            'handle': handle,
+            'name': name,
+            'queries': self.queries(),
+            'fields': list(self.fields)
+        }
+
+    def queries(self):
+        """Readings without a field ID, one NVML call each; each returns a slice of the device metrics"""
+        pynvml = self.pynvml
+
+        def memory(handle):
+            info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            return {'gpu_memory_used': info.used // (1024 * 1024), 'gpu_memory_total': info.total // (1024 * 1024)}  # MB
+
+        return {
+            'gpu_usage': lambda handle: {'gpu_usage': pynvml.nvmlDeviceGetUtilizationRates(handle).gpu},
+            'gpu_memory_used': memory,
+            'gpu_frequency': lambda handle: {'gpu_frequency': pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS)},
+            'gpu_temperature': lambda handle: {'gpu_temperature': pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)},
+            'gpu_fan_speed': lambda handle: {'gpu_fan_speed': pynvml.nvmlDeviceGetFanSpeed(handle)}
+        }
+
+    def read_device(self, device):
+        pynvml = self.pynvml
+        metrics = device_metrics(device['index'], device['name'])
+
+        for metric, query in list(device['queries'].items()):
+            try:
+                metrics.update(query(device['handle']))
+            except pynvml.NVMLError as e:
+                # Unsupported stays unsupported (e.g. no fan on a passively cooled board)
+                if e.value == pynvml.NVML_ERROR_NOT_SUPPORTED:
+                    del device['queries'][metric]
+                elif metric in NVML_REQUIRED:
+                    raise
+
+        if device['fields']:
+            values = pynvml.nvmlDeviceGetFieldValues(device['handle'], [field_id for _, field_id, _ in device['fields']])
+            for (metric, field_id, scale), value in zip(list(device['fields']), values):
+                if value.nvmlReturn == pynvml.NVML_SUCCESS:
+                    member = NVML_VALUE_MEMBERS.get(value.valueType)
+                    if member:  # a value type newer than this table; leave the reading out
+                        metrics[metric] = getattr(value.value, member) * scale
+                elif value.nvmlReturn == pynvml.NVML_ERROR_NOT_SUPPORTED:
+                    device['fields'].remove((metric, field_id, scale))
+        return metrics
+
+    def read(self, gpu_metrics):
+        gpus = [self.read_device(device) for device in self.devices]
+        return with_devices(gpu_metrics, gpus)
+
+    def close(self):
+        self.pynvml.nvmlShutdown()
+
+class GputilBackend:
+    """Any GPU nvidia-smi can see, through GPUtil"""
+    name = 'gputil'
+    install_hint = 'pip install gputil'
+
+    def __init__(self):
+        self.gputil = importlib.import_module('GPUtil')
+
+    def read(self, gpu_metrics):
+        gpus = []
+        # One nvidia-smi run reports every device
+        for index, gpu in enumerate(self.gputil.getGPUs()):
+            metrics = device_metrics(index, gpu.name)
+            metrics['gpu_usage'] = gpu.load * 100
+            metrics['gpu_memory_used'] = gpu.memoryUsed
+            metrics['gpu_memory_total'] = gpu.memoryTotal
+            metrics['gpu_temperature'] = gpu.temperature
+            gpus.append(metrics)
+        return with_devices(gpu_metrics, gpus)
+
+    def close(self):
+        pass
+
+def with_devices(gpu_metrics, gpus):
+    """Per-device list under 'gpus'; the flat gpu_* keys keep describing the first device"""
+    if gpus:
+        gpu_metrics.update({key: gpus[0][key] for key in EMPTY_GPU_METRICS if key != 'gpus'})
+    gpu_metrics['gpus'] = gpus
+    return gpu_metrics
+
+class GpuProbe:
+    """Imports and initialises the GPU backends on a background thread.
+
+    Driver init can take seconds (or hang) on a broken install, so nothing here
+    runs on the caller's thread; read() reports 'probing' until the probe is done.
+    """
+    BACKENDS = (NvmlBackend, GputilBackend)
+
+    def __init__(self, on_ready=None, nvml=None):
+        self.on_ready = on_ready
+        self.nvml = nvml
+        self.backends = []
+        self.status = PROBING
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.probe, name='gpu-probe', daemon=True)
+        self.thread.start()
+        return self
+
+    def probe(self):
+        backends = []
+        # A supplied NVML module (e.g. FakeNvml) replaces library discovery
+        if self.nvml is not None:
+            candidates = [(NvmlBackend, lambda: NvmlBackend(self.nvml))]
+        else:
+            candidates = [(backend_class, backend_class) for backend_class in self.BACKENDS]
+        for backend_class, create in candidates:
+            try:
+                backends.append(create())
+            except ImportError:
+                logger.info(f"{backend_class.name} not available. Install with: {backend_class.install_hint}")
+            except Exception as e:
+                logger.warning(f"{backend_class.name} initialisation failed: {e}")
+
+        self.backends = backends
+        self.status = READY if backends else UNAVAILABLE
+        if self.on_ready:
+            self.on_ready(self.status)
+
+    def read(self):
+        """GPU metrics plus 'gpu_status' from the first backend that reads successfully.
+
+        All zeros while probing and None once the probe found no backend; raises
+        the last error if every backend failed.
+        """
+        if self.status == UNAVAILABLE:
+            return None
+        gpu_metrics = dict(EMPTY_GPU_METRICS)
+        gpu_metrics['gpu_status'] = self.status
+
+        # An idle GPU legitimately reports 0%, so GPUtil (which forks nvidia-smi)
+        # is only asked when NVML is missing or fails
+        error = None
+        for backend in self.backends:
+            try:
+                return backend.read(dict(gpu_metrics))
+            except Exception as e:
+                error = e
+        if error:
+            raise error
+        return gpu_metrics
+
+    def close(self):
+        for backend in self.backends:
+            try:
+                backend.close()
+            except Exception:
+                pass
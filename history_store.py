@@ -0,0 +1,99 @@
+from array import array
+
+# NumPy is optional - fall back to the stdlib array module without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+class HistoryStore:
+    """Preallocated ring of samples: one column per metric plus a shared timestamp column.
+
+    Columns in `compact_fields` (percentages, temperatures) are float32; the rest
+    are float64, since float32 is only exact up to 2**24 and would round byte
+    totals and counters.
+    """
+    def __init__(self, fields, capacity, compact_fields=()):
+        self.fields = list(fields)
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+        compact = set(compact_fields)
+
+        # Every column is stored twice back to back, so the newest `capacity`
+        # samples always form one contiguous slice and views never need a copy
+        if NUMPY_AVAILABLE:
+            # One block per precision, so an append is a single assignment per block
+            self.blocks = []
+            self.columns = [None] * len(self.fields)
+            for dtype, is_compact in ((np.float32, True), (np.float64, False)):
+                rows = [i for i, field in enumerate(self.fields) if (field in compact) == is_compact]
+                block = np.zeros((len(rows), 2 * capacity), dtype=dtype)
+                self.blocks.append((np.array(rows, dtype=np.intp), block))
+                for row, i in enumerate(rows):
+                    self.columns[i] = block[row]
+            self.timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        else:
+            self.columns = [array('f' if field in compact else 'd') for field in self.fields]
+            for column in self.columns:
+                column.frombytes(bytes(column.itemsize * 2 * capacity))
+            self.timestamps = array('d', bytes(16 * capacity))
+
+    def append(self, timestamp, values):
+        """Append one row; `values` follows the order of `fields`"""
+        pos = self.head
+        mirror = pos + self.capacity
+
+        if NUMPY_AVAILABLE:
+            values = np.asarray(values, dtype=np.float64)
+            for rows, block in self.blocks:
+                block[:, pos] = values[rows]
+                block[:, mirror] = values[rows]
+        else:
+            for column, value in zip(self.columns, values):
+                column[pos] = value
+                column[mirror] = value
+        self.timestamps[pos] = timestamp
+        self.timestamps[mirror] = timestamp
+
+        self.head = (pos + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _window(self, last):
+        n = self.count if last is None else min(last, self.count)
+        end = self.head + self.capacity
+        return end - n, end
+
+    def _readonly(self, data, start, end):
+        if NUMPY_AVAILABLE:
+            view = data[start:end]
+            view.flags.writeable = False
+            return view
+        return memoryview(data)[start:end].toreadonly()
+
+    def view(self, field, last=None):
+        """Read-only view of the newest `last` samples of one metric, oldest first.
+
+        The view aliases the ring's storage, and appends overwrite its slots in place;
+        copy it to keep a snapshot.
+        """
+        start, end = self._window(last)
+        column = self.columns[self.field_index[field]]
+        return self._readonly(column, start, end)
+
+    def timestamps_view(self, last=None):
+        start, end = self._window(last)
+        return self._readonly(self.timestamps, start, end)
+
+    def latest(self, field):
+        if not self.count:
+            return 0
+        return self.columns[self.field_index[field]][self.head + self.capacity - 1]
+
+    def nbytes(self):
+        if NUMPY_AVAILABLE:
+            return sum(block.nbytes for _, block in self.blocks) + self.timestamps.nbytes
+        return sum(column.itemsize * len(column) for column in self.columns) + \
+            self.timestamps.itemsize * len(self.timestamps)
@@ -0,0 +1,154 @@
+import glob
+import os
+import re
+
+# Preferred CPU temperature chips, in order; any other chip's first input is the fallback
+CPU_TEMP_CHIPS = ['coretemp', 'cpu_thermal', 'k10temp', 'acpitz']
+
+# hwmon reports millidegrees Celsius and RPM
+SCALES = {'temp': 1000, 'fan': 1}
+
+def _read_text(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+def _index(path, kind):
+    match = re.match(rf'{kind}(\d+)_input$', os.path.basename(path))
+    return int(match.group(1)) if match else 0
+
+class HwmonSensor:
+    """One temp*_input or fan*_input file, kept open and re-read from offset 0"""
+    def __init__(self, chip, kind, index, path):
+        self.chip = chip
+        self.kind = kind
+        self.index = index
+        self.path = path
+        self.scale = SCALES[kind]
+
+        # Labels and limits don't change, so they are read once here
+        prefix = path[:-len('_input')]
+        self.label = _read_text(prefix + '_label')
+        self.high = self._read_limit(prefix + '_max')
+        self.critical = self._read_limit(prefix + '_crit')
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def _read_limit(self, path):
+        text = _read_text(path)
+        return int(text) / self.scale if text.lstrip('-').isdigit() else None
+
+    def read(self):
+        return int(os.pread(self.fd, 32, 0)) / self.scale
+
+    def describe(self):
+        return {'chip': self.chip, 'kind': self.kind, 'label': self.label, 'path': self.path}
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+class HwmonSensors:
+    """Every hwmon temperature and fan input, discovered in one walk of /sys/class/hwmon.
+
+    Later reads only touch the selected *_input files through open descriptors,
+    instead of re-walking the hwmon tree on every tick like psutil does.
+    """
+    def __init__(self, sys_root='/sys'):
+        self.sys_root = sys_root
+        self.temps = []
+        self.fans = []
+        self.cpu_temp_sensor = None
+        self.discover()
+
+    @classmethod
+    def available(cls, sys_root='/sys'):
+        """True when some hwmon chip exposes a temperature or fan input"""
+        chips = os.path.join(sys_root, 'class/hwmon/hwmon*')
+        return hasattr(os, 'pread') and bool(glob.glob(os.path.join(chips, 'temp*_input')) or
+                                             glob.glob(os.path.join(chips, 'fan*_input')))
+
+    def discover(self):
+        chips = {}
+        hwmon_dirs = glob.glob(os.path.join(self.sys_root, 'class/hwmon/hwmon*'))
+        hwmon_dirs.sort(key=lambda path: int(re.sub(r'\D', '', os.path.basename(path)) or 0))
+        for hwmon_dir in hwmon_dirs:
+            chip = _read_text(os.path.join(hwmon_dir, 'name')) or os.path.basename(hwmon_dir)
+            for kind, sensors in (('temp', self.temps), ('fan', self.fans)):
+                paths = sorted(glob.glob(os.path.join(hwmon_dir, f'{kind}*_input')),
+                               key=lambda path: _index(path, kind))
+                for path in paths:
+                    try:
+                        sensor = HwmonSensor(chip, kind, _index(path, kind), path)
+                    except OSError:
+                        continue
+                    sensors.append(sensor)
+                    if kind == 'temp':
+                        chips.setdefault(chip, sensor)
+
+        # CPU temperature: first input of the preferred chip, else of any chip
+        for chip in CPU_TEMP_CHIPS + list(chips):
+            if chip in chips:
+                self.cpu_temp_sensor = chips[chip]
+                break
+
+    def sensor_map(self):
+        """Labels and file paths of everything discovered"""
+        return {
+            'temperatures': [sensor.describe() for sensor in self.temps],
+            'fans': [sensor.describe() for sensor in self.fans],
+            'cpu_temp': self.cpu_temp_sensor.describe() if self.cpu_temp_sensor else None
+        }
+
+    def read_cpu_temp(self):
+        """Degrees Celsius, or None when there is no temperature sensor"""
+        return self.cpu_temp_sensor.read() if self.cpu_temp_sensor else None
+
+    def read_temperatures(self):
+        """Every temperature sensor; one that fails to read (e.g. a sleeping drive) is left out"""
+        temperatures = []
+        for sensor in self.temps:
+            try:
+                current = sensor.read()
+            except (OSError, ValueError):
+                continue
+            temperatures.append({
+                'chip': sensor.chip,
+                'label': sensor.label or f'temp{sensor.index}',
+                'current': current,
+                'high': sensor.high,
+                'critical': sensor.critical
+            })
+        return temperatures
+
+    def read_fans(self):
+        """Speeds in RPM, named like psutil.sensors_fans() entries"""
+        fan_speeds = []
+        for sensor in self.fans:
+            try:
+                speed = sensor.read()
+            except (OSError, ValueError):
+                continue
+            name = f'{sensor.chip} {sensor.label or sensor.index}'
+            fan_speeds.append({'name': name, 'speed': int(speed)})
+        return fan_speeds
+
+    def close(self):
+        for sensor in self.temps + self.fans:
+            sensor.close()
+        self.temps = []
+        self.fans = []
+        self.cpu_temp_sensor = None
+
+def open_sensors(sys_root='/sys'):
+    """HwmonSensors, or None when discovery opened no input so callers fall back to psutil"""
+    if not HwmonSensors.available(sys_root):
+        return None
+    sensors = HwmonSensors(sys_root)
+    if not sensors.temps and not sensors.fans:
+        sensors.close()
+        return None
+    return sensors
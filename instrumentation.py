@@ -0,0 +1,134 @@
+import json
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 250)
+
+class RollingHistogram:
+    """Bucketed durations over the newest `window` samples"""
+    def __init__(self, window=300, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = bounds
+        self.samples = deque(maxlen=window)
+        self.counts = [0] * (len(bounds) + 1)
+
+    def add(self, seconds):
+        if len(self.samples) == self.samples.maxlen:
+            self.counts[self.bucket(self.samples[0])] -= 1
+        self.samples.append(seconds)
+        self.counts[self.bucket(seconds)] += 1
+
+    def bucket(self, seconds):
+        return bisect_left(self.bounds, seconds * 1000)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def mean(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0
+
+    def summary(self):
+        labels = [f'<={bound}ms' for bound in self.bounds] + [f'>{self.bounds[-1]}ms']
+        return {
+            'count': len(self.samples),
+            'mean_ms': self.mean() * 1000,
+            'p50_ms': self.percentile(0.5) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'max_ms': max(self.samples, default=0) * 1000,
+            'buckets': dict(zip(labels, self.counts))
+        }
+
+class Instrumentation:
+    """Frame, render, collection and sample-to-pixel timings for the dashboard"""
+    def __init__(self, window=300):
+        self.window = window
+        self.frame_intervals = RollingHistogram(window)  # start to start, i.e. 1/fps
+        self.frame_times = RollingHistogram(window)      # work done inside one frame
+        self.render = {}      # widget group -> RollingHistogram
+        self.collection = {}  # metric source -> its MetricSource.durations
+        self.latency = RollingHistogram(window)
+        self.source_stats = {}  # metric source -> MetricSource.stats()
+        self.started = time.time()
+
+    def _histogram(self, table, name):
+        if name not in table:
+            table[name] = RollingHistogram(self.window)
+        return table[name]
+
+    def record_frame(self, interval, duration):
+        if interval:
+            self.frame_intervals.add(interval)
+        self.frame_times.add(duration)
+
+    @contextmanager
+    def measure(self, group):
+        """Time a block of rendering work under a widget group name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._histogram(self.render, group).add(time.perf_counter() - start)
+
+    def record_sources(self, sources):
+        """Pick up each MetricSource's read durations and its cost and failure stats.
+
+        Sources time every read themselves, so reads between two calls are not lost.
+        """
+        for name, source in list(sources.items()):
+            if source.samples:
+                self.collection[name] = source.durations
+                self.source_stats[name] = source.stats()
+
+    def record_latency(self, seconds):
+        self.latency.add(max(0, seconds))
+
+    def fps(self):
+        mean = self.frame_intervals.mean()
+        return 1 / mean if mean else 0
+
+    def slowest(self, table, count=2):
+        ranked = sorted(table.items(), key=lambda item: item[1].mean(), reverse=True)
+        return [(name, histogram.mean() * 1000) for name, histogram in ranked[:count]]
+
+    def overlay_text(self):
+        lines = [
+            f"FPS: {self.fps():.1f}  frame p95 {self.frame_times.percentile(0.95) * 1000:.1f}ms",
+            f"latency p50 {self.latency.percentile(0.5) * 1000:.0f}ms"
+        ]
+        render = ', '.join(f"{name} {ms:.1f}ms" for name, ms in self.slowest(self.render))
+        if render:
+            lines.append(f"render: {render}")
+        collection = ', '.join(f"{name} {ms:.1f}ms" for name, ms in self.slowest(self.collection))
+        if collection:
+            lines.append(f"sensors: {collection}")
+        backing_off = ', '.join(name for name, stats in self.source_stats.items() if stats['breaker_open'])
+        if backing_off:
+            lines.append(f"backing off: {backing_off}")
+        return '\n'.join(lines)
+
+    def snapshot(self):
+        return {
+            'timestamp': time.time(),
+            'uptime': time.time() - self.started,
+            'fps': self.fps(),
+            'frame_interval': self.frame_intervals.summary(),
+            'frame_time': self.frame_times.summary(),
+            'sample_to_pixel_latency': self.latency.summary(),
+            'render': {name: histogram.summary() for name, histogram in self.render.items()},
+            'collection': {name: histogram.summary() for name, histogram in self.collection.items()},
+            'sources': self.source_stats
+        }
+
+    def export(self, path, extra=None):
+        """Write the current snapshot (plus any `extra` sections) as JSON"""
+        report = self.snapshot()
+        if extra:
+            report.update(extra)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return path
@@ -0,0 +1,201 @@
+import os
+import glob
+
+from hwmon_sensors import open_sensors
+
+class ProcfsBackend:
+    """Linux fast path that re-reads /proc and /sys files through open descriptors"""
+
+    # Sources this backend can serve instead of psutil
+    SOURCES = ('cpu', 'ram', 'swap', 'cpu_freq', 'cpu_temp', 'fans', 'disk')
+    SENSOR_SOURCES = ('cpu_temp', 'fans')
+
+    def __init__(self, proc_root='/proc', sys_root='/sys', disk_path='/'):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.disk_path = disk_path
+        self.fds = []
+
+        try:
+            self.stat_fd = self._open_required(os.path.join(proc_root, 'stat'))
+            self.meminfo_fd = self._open_required(os.path.join(proc_root, 'meminfo'))
+        except OSError:
+            self.close_fds()
+            raise
+        # Only the aggregate "cpu" line of /proc/stat is needed, so a small
+        # buffer avoids pulling in the (potentially huge) intr line
+        self.stat_buf = bytearray(512)
+        self.meminfo_buf = bytearray(8192)
+        self.value_buf = bytearray(32)
+
+        self.prev_cpu_total = 0
+        self.prev_cpu_idle = 0
+
+        self.freq_fds = []
+        self.max_freq = 0
+        self.cpuinfo_fd = None
+        self.cpuinfo_buf = None
+        self.discover_cpufreq()
+        # Without hwmon inputs, temperatures and fans are left to psutil
+        self.sensors = open_sensors(sys_root)
+        self.sources = [name for name in self.SOURCES if self.sensors or name not in self.SENSOR_SOURCES]
+
+    @classmethod
+    def available(cls, proc_root='/proc'):
+        return hasattr(os, 'preadv') and os.path.exists(os.path.join(proc_root, 'stat'))
+
+    def _open(self, path):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        self.fds.append(fd)
+        return fd
+
+    def _open_required(self, path):
+        """Like _open, but raises so the caller falls back to psutil"""
+        fd = os.open(path, os.O_RDONLY)
+        self.fds.append(fd)
+        return fd
+
+    def _read(self, fd, buf):
+        """Re-read a file from offset 0 into a preallocated buffer"""
+        size = os.preadv(fd, [buf], 0)
+        return memoryview(buf)[:size]
+
+    def _read_int(self, fd):
+        return int(bytes(self._read(fd, self.value_buf)))
+
+    def _read_text(self, path):
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return ''
+
+    def discover_cpufreq(self):
+        cpu_dirs = glob.glob(os.path.join(self.sys_root, 'devices/system/cpu/cpu[0-9]*/cpufreq'))
+        for cpu_dir in sorted(cpu_dirs):
+            fd = self._open(os.path.join(cpu_dir, 'scaling_cur_freq'))
+            if fd is not None:
+                self.freq_fds.append(fd)
+
+        if cpu_dirs:
+            max_freq = self._read_text(os.path.join(sorted(cpu_dirs)[0], 'cpuinfo_max_freq'))
+            self.max_freq = int(max_freq) / 1000 if max_freq else 0  # kHz -> MHz
+
+        # VMs and some ARM boards have no cpufreq; /proc/cpuinfo still reports "cpu MHz"
+        if not self.freq_fds:
+            self.cpuinfo_fd = self._open(os.path.join(self.proc_root, 'cpuinfo'))
+            if self.cpuinfo_fd is not None:
+                self.cpuinfo_buf = bytearray(len(self._read_text(os.path.join(self.proc_root, 'cpuinfo'))) * 2 + 4096)
+
+    def _cpuinfo_mhz(self):
+        """Per-CPU "cpu MHz" values from /proc/cpuinfo"""
+        data = self._read(self.cpuinfo_fd, self.cpuinfo_buf)
+        if len(data) == len(self.cpuinfo_buf):
+            # CPUs came online since discovery; grow and read again
+            self.cpuinfo_buf = bytearray(len(self.cpuinfo_buf) * 2)
+            return self._cpuinfo_mhz()
+        return [float(line.partition(b':')[2]) for line in bytes(data).splitlines() if line.startswith(b'cpu MHz')]
+
+    # Source readers - same keys and units as MetricsCollector; None when there is no sensor
+    def read_cpu(self):
+        data = bytes(self._read(self.stat_fd, self.stat_buf))
+        times = [int(value) for value in data[:data.index(b'\n')].split()[1:9]]
+        total = sum(times)
+        idle = times[3] + times[4]  # idle + iowait
+
+        total_delta = total - self.prev_cpu_total
+        idle_delta = idle - self.prev_cpu_idle
+        self.prev_cpu_total = total
+        self.prev_cpu_idle = idle
+
+        if total_delta <= 0:
+            return {'cpu_percent': 0.0}
+        return {'cpu_percent': round(100.0 * (total_delta - idle_delta) / total_delta, 1)}
+
+    def _meminfo(self):
+        meminfo = {}
+        for line in bytes(self._read(self.meminfo_fd, self.meminfo_buf)).splitlines():
+            key, _, rest = line.partition(b':')
+            meminfo[key] = int(rest.split()[0]) * 1024
+        return meminfo
+
+    def read_ram(self):
+        meminfo = self._meminfo()
+        total = meminfo[b'MemTotal']
+        free = meminfo[b'MemFree']
+        available = meminfo.get(b'MemAvailable', free)
+        cached = meminfo.get(b'Cached', 0) + meminfo.get(b'SReclaimable', 0)
+        used = total - free - meminfo.get(b'Buffers', 0) - cached
+        if used < 0:
+            used = total - free
+
+        return {
+            'ram_percent': round((total - available) / total * 100, 1) if total else 0,
+            'ram_used': used // (1024**3),  # GB
+            'ram_total': total // (1024**3),  # GB
+            'ram_used_bytes': used,
+            'ram_total_bytes': total
+        }
+
+    def read_swap(self):
+        meminfo = self._meminfo()
+        total = meminfo.get(b'SwapTotal', 0)
+        free = meminfo.get(b'SwapFree', 0)
+        return {'vram_percent': round((total - free) / total * 100, 1) if total else 0}
+
+    def read_cpu_freq(self):
+        if not self.freq_fds:
+            mhz = self._cpuinfo_mhz() if self.cpuinfo_fd is not None else []
+            if not mhz:
+                return {'cpu_freq': 0, 'cpu_max_freq': 0}
+            return {'cpu_freq': sum(mhz) / len(mhz), 'cpu_max_freq': self.max_freq}
+        total = sum(self._read_int(fd) for fd in self.freq_fds)
+        return {
+            'cpu_freq': total / len(self.freq_fds) / 1000,  # kHz -> MHz
+            'cpu_max_freq': self.max_freq
+        }
+
+    def read_cpu_temp(self):
+        if not self.sensors:
+            return None
+        cpu_temp = self.sensors.read_cpu_temp()
+        if cpu_temp is None:
+            return None
+        return {'cpu_temp': cpu_temp, 'temperatures': self.sensors.read_temperatures()}
+
+    def read_fans(self):
+        if not self.sensors:
+            return None
+        fan_speeds = self.sensors.read_fans()
+        if not fan_speeds:
+            return None
+        return {'fan_speeds': fan_speeds, 'fan_count': len(fan_speeds)}
+
+    def read_disk(self):
+        st = os.statvfs(self.disk_path)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        available = st.f_bavail * st.f_frsize
+        return {
+            'disk_percent': round(used / (used + available) * 100, 1) if used + available else 0,
+            'disk_used': used // (1024**3),  # GB
+            'disk_total': total // (1024**3),  # GB
+            'disk_used_bytes': used,
+            'disk_total_bytes': total
+        }
+
+    def close(self):
+        if self.sensors:
+            self.sensors.close()
+        self.close_fds()
+
+    def close_fds(self):
+        for fd in self.fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fds = []
@@ -0,0 +1,125 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Metrics dict key -> (exposition name, help text); all are gauges
+PROM_METRICS = [
+    ('cpu_percent', 'sysmon_cpu_usage_percent', 'CPU utilisation in percent'),
+    ('cpu_freq', 'sysmon_cpu_frequency_mhz', 'Current CPU frequency in MHz'),
+    ('cpu_max_freq', 'sysmon_cpu_max_frequency_mhz', 'Maximum CPU frequency in MHz'),
+    ('cpu_temp', 'sysmon_cpu_temperature_celsius', 'CPU temperature in degrees Celsius'),
+    ('ram_percent', 'sysmon_memory_usage_percent', 'RAM utilisation in percent'),
+    ('ram_used_bytes', 'sysmon_memory_used_bytes', 'RAM in use in bytes'),
+    ('ram_total_bytes', 'sysmon_memory_total_bytes', 'Total RAM in bytes'),
+    ('vram_percent', 'sysmon_swap_usage_percent', 'Swap utilisation in percent'),
+    ('disk_percent', 'sysmon_disk_usage_percent', 'Root filesystem utilisation in percent'),
+    ('disk_used_bytes', 'sysmon_disk_used_bytes', 'Root filesystem space used in bytes'),
+    ('disk_total_bytes', 'sysmon_disk_total_bytes', 'Root filesystem size in bytes'),
+]
+
+# GPU gauges; one series per device (labelled gpu and name) when the collector lists 'gpus',
+# otherwise a single unlabelled series from the flat gpu_* keys
+PROM_GPU_METRICS = [
+    ('gpu_usage', 'sysmon_gpu_usage_percent', 'GPU utilisation in percent'),
+    ('gpu_frequency', 'sysmon_gpu_frequency_mhz', 'GPU graphics clock in MHz'),
+    ('gpu_memory_used', 'sysmon_gpu_memory_used_megabytes', 'GPU memory in use in MB'),
+    ('gpu_memory_total', 'sysmon_gpu_memory_total_megabytes', 'Total GPU memory in MB'),
+    ('gpu_temperature', 'sysmon_gpu_temperature_celsius', 'GPU temperature in degrees Celsius'),
+    ('gpu_fan_speed', 'sysmon_gpu_fan_speed_percent', 'GPU fan speed in percent'),
+    ('gpu_power', 'sysmon_gpu_power_watts', 'GPU power draw in watts'),
+    ('gpu_memory_temperature', 'sysmon_gpu_memory_temperature_celsius', 'GPU memory temperature in degrees Celsius'),
+]
+
+# Monotonic totals, only present when the collector daemon samples the network
+PROM_COUNTERS = [
+    ('net_bytes_sent', 'sysmon_network_sent_bytes_total', 'Bytes sent on all interfaces'),
+    ('net_bytes_recv', 'sysmon_network_received_bytes_total', 'Bytes received on all interfaces'),
+]
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def render_exposition(metrics):
+    """Render one metrics dict in the Prometheus text exposition format"""
+    lines = []
+    for metric_type, table in (('gauge', PROM_METRICS), ('counter', PROM_COUNTERS)):
+        for key, name, help_text in table:
+            if key not in metrics:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.append(f'{name} {float(metrics[key])!r}')
+
+    gpus = metrics.get('gpus')
+    for key, name, help_text in PROM_GPU_METRICS:
+        if gpus:
+            series = [(f'{{gpu="{gpu["index"]}",name="{escape_label(gpu["name"])}"}}', gpu[key])
+                      for gpu in gpus if key in gpu]
+        else:
+            series = [('', metrics[key])] if key in metrics else []
+        if series:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(f'{name}{labels} {float(value)!r}' for labels, value in series)
+
+    fans = [fan for fan in metrics.get('fan_speeds', []) if fan['speed']]
+    if fans:
+        lines.append('# HELP sysmon_fan_speed_rpm Fan speed in RPM')
+        lines.append('# TYPE sysmon_fan_speed_rpm gauge')
+        for fan in fans:
+            lines.append(f'sysmon_fan_speed_rpm{{fan="{escape_label(fan["name"])}"}} {float(fan["speed"])!r}')
+
+    temperatures = metrics.get('temperatures', [])
+    if temperatures:
+        lines.append('# HELP sysmon_temperature_celsius Temperature sensor reading in degrees Celsius')
+        lines.append('# TYPE sysmon_temperature_celsius gauge')
+        seen = set()
+        for sensor in temperatures:
+            # Identical chips (e.g. two NVMe drives) would otherwise repeat a series
+            labels = f'chip="{escape_label(sensor["chip"])}",sensor="{escape_label(sensor["label"])}"'
+            if labels not in seen:
+                seen.add(labels)
+                lines.append(f'sysmon_temperature_celsius{{{labels}}} {float(sensor["current"])!r}')
+
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        # Pre-rendered once per collection cycle; scrapes never touch psutil
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsEndpoint(ThreadingHTTPServer):
+    """Background HTTP server exposing the latest sample at /metrics"""
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=9105):
+        super().__init__((host, port), MetricsRequestHandler)
+        self.body = b''
+        self.thread = None
+
+    def publish(self, metrics):
+        """Render once; handlers serve this cached body until the next cycle"""
+        self.body = render_exposition(metrics)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,63 @@
+import time
+
+import psutil
+
+# Counters read by read_system_counters(), all monotonically increasing
+SYSTEM_COUNTERS = ('net_bytes_sent', 'net_bytes_recv', 'disk_read_bytes', 'disk_write_bytes',
+                   'ctx_switches', 'interrupts')
+
+def read_system_counters():
+    """Raw cumulative counters; nothing here blocks or sleeps"""
+    counters = {}
+
+    net_io = psutil.net_io_counters()
+    if net_io:
+        counters['net_bytes_sent'] = net_io.bytes_sent
+        counters['net_bytes_recv'] = net_io.bytes_recv
+
+    disk_io = psutil.disk_io_counters()
+    if disk_io:
+        counters['disk_read_bytes'] = disk_io.read_bytes
+        counters['disk_write_bytes'] = disk_io.write_bytes
+
+    cpu_stats = psutil.cpu_stats()
+    counters['ctx_switches'] = cpu_stats.ctx_switches
+    counters['interrupts'] = cpu_stats.interrupts
+    return counters
+
+class RateEngine:
+    """Per-second rates from cumulative counters using the real time between samples"""
+    def __init__(self):
+        self.previous = {}  # name -> (timestamp, value)
+
+    def update(self, name, value, timestamp=None):
+        """Store a raw counter and return its rate since the previous one.
+
+        Returns None for the first sample and after a counter reset or wrap.
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        previous = self.previous.get(name)
+        self.previous[name] = (timestamp, value)
+        if previous is None:
+            return None
+
+        elapsed = timestamp - previous[0]
+        delta = value - previous[1]
+        if elapsed <= 0 or delta < 0:
+            return None
+        return delta / elapsed
+
+    def update_many(self, counters, timestamp=None):
+        """Rates for a dict of counters sharing one timestamp; unknown rates are 0"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        rates = {}
+        for name, value in counters.items():
+            rate = self.update(name, value, timestamp)
+            rates[name] = 0 if rate is None else rate
+        return rates
+
+    def reset(self, name=None):
+        if name is None:
+            self.previous.clear()
+        else:
+            self.previous.pop(name, None)
@@ -3,8 +3,7 @@ from tkinter import ttk
 import psutil
 import threading
 import time
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tk_chart import TkChart
 
 class SystemMonitor:
     def __init__(self, root):
@@ -40,6 +39,9 @@ class SystemMonitor:
         # Setup Memory tab
         self.setup_memory_tab()
         
+        # A chart on a hidden tab is skipped, so catch it up when its tab is shown
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.update_graphs())
+        
         # Start monitoring thread
         self.monitoring = True
         self.monitor_thread = threading.Thread(target=self.update_data)
@@ -91,18 +93,7 @@ class SystemMonitor:
         self.cpu_count_label.pack(fill=tk.X)
         
         # CPU Usage Graph
-        self.cpu_fig = Figure(figsize=(6, 3), dpi=100, facecolor='#1e1e1e')
-        self.cpu_ax = self.cpu_fig.add_subplot(111)
-        self.cpu_ax.set_facecolor('#1e1e1e')
-        self.cpu_ax.tick_params(colors='white')
-        self.cpu_ax.set_ylabel('CPU Usage (%)', color='white')
-        self.cpu_ax.set_xlabel('Time (s)', color='white')
-        self.cpu_ax.set_ylim(0, 100)
-        self.cpu_ax.set_xlim(-60, 0)
-        self.cpu_line, = self.cpu_ax.plot(self.time_points, self.cpu_data, 'r-', linewidth=2)
-        
-        self.cpu_canvas = FigureCanvasTkAgg(self.cpu_fig, self.cpu_tab)
-        self.cpu_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.cpu_chart = self.create_chart(self.cpu_tab, 'CPU Usage (%)', self.cpu_data, '#ff0000')
     
     def setup_memory_tab(self):
         # Memory Usage Label
@@ -133,18 +124,15 @@ class SystemMonitor:
         self.memory_available_label.pack(fill=tk.X)
         
         # Memory Usage Graph
-        self.memory_fig = Figure(figsize=(6, 3), dpi=100, facecolor='#1e1e1e')
-        self.memory_ax = self.memory_fig.add_subplot(111)
-        self.memory_ax.set_facecolor('#1e1e1e')
-        self.memory_ax.tick_params(colors='white')
-        self.memory_ax.set_ylabel('Memory Usage (%)', color='white')
-        self.memory_ax.set_xlabel('Time (s)', color='white')
-        self.memory_ax.set_ylim(0, 100)
-        self.memory_ax.set_xlim(-60, 0)
-        self.memory_line, = self.memory_ax.plot(self.time_points, self.memory_data, 'g-', linewidth=2)
-        
-        self.memory_canvas = FigureCanvasTkAgg(self.memory_fig, self.memory_tab)
-        self.memory_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.memory_chart = self.create_chart(self.memory_tab, 'Memory Usage (%)', self.memory_data, '#008000')
+    
+    def create_chart(self, parent, ylabel, data, color):
+        """0-100% usage chart over the last 60 seconds, packed into `parent`"""
+        chart = TkChart(parent, xlim=(-60, 0), ylim=(0, 100), color=color,
+                        xlabel='Time (s)', ylabel=ylabel, height=300)
+        chart.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        chart.set_data(self.time_points, data)
+        return chart
     
     def update_data(self):
         while self.monitoring:
@@ -207,17 +195,18 @@ class SystemMonitor:
         self.update_graphs()
     
     def update_graphs(self):
+        # Axes are fixed, so only the visible chart's line is redrawn
+        if self.root.state() == 'iconic':
+            return
+        visible_tab = self.notebook.select()
+        
         # Update CPU graph
-        self.cpu_line.set_data(self.time_points, self.cpu_data)
-        self.cpu_ax.relim()
-        self.cpu_ax.autoscale_view()
-        self.cpu_canvas.draw_idle()
+        if visible_tab == str(self.cpu_tab):
+            self.cpu_chart.set_ydata(self.cpu_data)
         
         # Update Memory graph
-        self.memory_line.set_data(self.time_points, self.memory_data)
-        self.memory_ax.relim()
-        self.memory_ax.autoscale_view()
-        self.memory_canvas.draw_idle()
+        if visible_tab == str(self.memory_tab):
+            self.memory_chart.set_ydata(self.memory_data)
     
     def on_closing(self):
         self.monitoring = False
@@ -5,6 +5,17 @@ import math
 import threading
 import time
 
+from collector_daemon import RingReader, dashboard_sample, refresh_feed
+from rate_engine import RateEngine, read_system_counters
+from ui_mailbox import UpdateMailbox
+from frame_clock import FrameClock
+
+# Target frame rate of the UI clock
+TARGET_FPS = 30
+
+# How quickly needles close the gap to a new value (1/s)
+NEEDLE_RESPONSE = 8.0
+
 class SpeedometerMonitor:
     def __init__(self, root):
         self.root = root
@@ -24,6 +35,9 @@ class SpeedometerMonitor:
             'glass': '#aaffff'
         }
         
+        # Cached dial layers
+        self.dials = {}  # canvas -> needle/value item ids of its dial
+        
         # Monitoring data
         self.cpu_usage = 0
         self.memory_usage = 0
@@ -32,13 +46,25 @@ class SpeedometerMonitor:
         self.network_download = 0
         
         # Network data for calculating speeds
-        self.prev_net_io = None
+        self.rates = RateEngine()
+        self.system_rates = {}
         self.network_samples = []
         
         self.monitoring = True
         
+        # Latest snapshot for the Tk loop; older ones are dropped, never queued
+        self.mailbox = UpdateMailbox()
+        
+        # Read from the shared collector instead of polling psutil, if it is running
+        self.feed = RingReader.attach()
+        
         self.create_widgets()
         self.start_monitoring()
+        # One clock on the Tk loop drives data refresh and animation
+        self.clock = FrameClock(self.root, TARGET_FPS)
+        self.clock.add_task(lambda dt: self.mailbox.drain(self.apply_snapshot))
+        self.clock.add_task(self.animate_needles)
+        self.clock.start()
     
     def create_widgets(self):
         # Main container with vintage border
@@ -158,7 +184,48 @@ class SpeedometerMonitor:
         self.draw_speedometer(self.network_canvas, "NET", 0)
     
     def draw_speedometer(self, canvas, label, value):
-        canvas.delete("all")
+        # Static layers are drawn once; later calls only retarget the needle and set the text
+        dial = self.dials.get(canvas)
+        if dial is None:
+            dial = self.create_dial(canvas, label)
+        
+        # The frame clock eases the needle towards the new value
+        dial['target'] = value
+        if dial['shown'] is None:
+            self.move_needle(dial, value)
+        
+        value_text = f"{value:.1f}%"
+        if label == "NET":  # Network shows MB/s
+            value_text = f"{value:.2f}\nMB/s"
+        if value_text != dial['value_text']:
+            canvas.itemconfig(dial['value_item'], text=value_text)
+            dial['value_text'] = value_text
+    
+    def move_needle(self, dial, value):
+        angle = self.value_to_angle(value, dial['label'])
+        needle_length = dial['radius'] - 30
+        end_x = dial['cx'] + needle_length * math.sin(math.radians(angle))
+        end_y = dial['cy'] - needle_length * math.cos(math.radians(angle))
+        needle_end = (round(end_x, 1), round(end_y, 1))
+        if needle_end != dial['needle_end']:
+            dial['canvas'].coords(dial['needle'], dial['cx'], dial['cy'], *needle_end)
+            dial['needle_end'] = needle_end
+        dial['shown'] = value
+    
+    def animate_needles(self, dt):
+        """Frame clock task: move each needle part of the way to its target"""
+        for dial in self.dials.values():
+            target = dial['target']
+            if dial['shown'] is None or dial['shown'] == target:
+                continue
+            step = min(1.0, dt * NEEDLE_RESPONSE)
+            value = dial['shown'] + (target - dial['shown']) * step
+            if abs(target - value) < 0.05:
+                value = target
+            self.move_needle(dial, value)
+    
+    def create_dial(self, canvas, label):
+        """Draw every dial layer once, keeping the needle and value text for updates"""
         width = 300
         height = 300
         center_x = width // 2
@@ -179,15 +246,9 @@ class SpeedometerMonitor:
         # Draw scale markings
         self.draw_scale_marks(canvas, center_x, center_y, radius, label)
         
-        # Draw needle
-        angle = self.value_to_angle(value, label)
-        needle_length = radius - 30
-        end_x = center_x + needle_length * math.sin(math.radians(angle))
-        end_y = center_y - needle_length * math.cos(math.radians(angle))
-        
-        # Draw needle with pivot point
-        canvas.create_line(center_x, center_y, end_x, end_y, 
-                          fill=self.colors['needle'], width=3, arrow=tk.LAST, arrowshape=(8, 10, 5))
+        # Draw needle with pivot point; it stays stacked below the value display and glass
+        needle = canvas.create_line(center_x, center_y, center_x, center_y,
+                                   fill=self.colors['needle'], width=3, arrow=tk.LAST, arrowshape=(8, 10, 5))
         canvas.create_oval(center_x - 5, center_y - 5, center_x + 5, center_y + 5,
                           fill=self.colors['needle'], outline=self.colors['accent'])
         
@@ -197,12 +258,8 @@ class SpeedometerMonitor:
                           center_x + display_radius, center_y + display_radius,
                           fill=self.colors['dial_bg'], outline=self.colors['accent'])
         
-        value_text = f"{value:.1f}%"
-        if label == "NET":  # Network shows MB/s
-            value_text = f"{value:.2f}\nMB/s"
-        
-        canvas.create_text(center_x, center_y, text=value_text,
-                          font=("Arial", 12, "bold"), fill=self.colors['text'])
+        value_item = canvas.create_text(center_x, center_y, text="",
+                                       font=("Arial", 12, "bold"), fill=self.colors['text'])
         
         # Draw label
         canvas.create_text(center_x, center_y + radius - 20, text=label,
@@ -210,6 +267,13 @@ class SpeedometerMonitor:
         
         # Draw glass reflection effect
         self.draw_glass_effect(canvas, center_x, center_y, radius)
+        
+        dial = {'canvas': canvas, 'label': label,
+                'cx': center_x, 'cy': center_y, 'radius': radius,
+                'needle': needle, 'needle_end': None, 'shown': None, 'target': 0,
+                'value_item': value_item, 'value_text': None}
+        self.dials[canvas] = dial
+        return dial
     
     def draw_scale_marks(self, canvas, cx, cy, radius, label):
         max_value = 100
@@ -274,20 +338,10 @@ class SpeedometerMonitor:
         
         return 135 + (scaled_value * 2.7)  # 135° to 405° = 270° sweep
     
-    def get_network_speed(self):
-        """Get current network upload/download speed in MB/s"""
-        current_net_io = psutil.net_io_counters()
-        
-        if self.prev_net_io is None:
-            self.prev_net_io = current_net_io
-            return 0, 0
-        
-        # Calculate speeds in MB/s
-        time_diff = 1  # 1 second interval
-        upload_speed = (current_net_io.bytes_sent - self.prev_net_io.bytes_sent) / (1024 * 1024) / time_diff
-        download_speed = (current_net_io.bytes_recv - self.prev_net_io.bytes_recv) / (1024 * 1024) / time_diff
-        
-        self.prev_net_io = current_net_io
+    def get_network_speed(self, rates):
+        """Get current network upload/download speed in MB/s from per-second byte rates"""
+        upload_speed = rates.get('net_bytes_sent', 0) / (1024 * 1024)
+        download_speed = rates.get('net_bytes_recv', 0) / (1024 * 1024)
         
         # Smooth the network speed (average last 3 samples)
         self.network_samples.append(upload_speed)
@@ -306,12 +360,47 @@ class SpeedometerMonitor:
             bytes_size /= 1024.0
         return f"{bytes_size:.1f} PB"
     
+    def read_shared_sample(self):
+        """Update the display from the collector daemon's latest sample"""
+        sample = self.feed.latest()
+        if sample is None:
+            return
+        sample = dashboard_sample(sample)
+        
+        self.cpu_usage = sample.cpu_percent
+        self.memory_usage = sample.memory.percent
+        self.disk_usage = (sample.disk.used / sample.disk.total) * 100 if sample.disk.total else 0
+        
+        # Rates over the time between the daemon's own samples
+        self.system_rates = self.rates.update_many({
+            'net_bytes_sent': sample.net_io.bytes_sent,
+            'net_bytes_recv': sample.net_io.bytes_recv
+        }, sample.timestamp)
+        upload_speed, download_speed = self.get_network_speed(self.system_rates)
+        self.network_upload = upload_speed
+        self.network_download = download_speed
+        
+        self.mailbox.publish((self.cpu_usage, self.memory_usage, 
+                              self.disk_usage, upload_speed,
+                              sample.memory, sample.disk, download_speed))
+    
     def start_monitoring(self):
         def monitor():
+            psutil.cpu_percent(interval=None)  # prime the CPU baseline
             while self.monitoring:
                 try:
-                    # CPU usage
-                    self.cpu_usage = psutil.cpu_percent(interval=0.5)
+                    # Re-attach, or fall back to local polling, once the daemon stops publishing
+                    feed = refresh_feed(self.feed)
+                    if feed is not self.feed:
+                        self.feed = feed
+                        self.rates.reset()
+                    if self.feed:
+                        self.read_shared_sample()
+                        time.sleep(1)
+                        continue
+                    
+                    # CPU usage since the previous pass; never blocks
+                    self.cpu_usage = psutil.cpu_percent(interval=None)
                     
                     # Memory usage
                     memory = psutil.virtual_memory()
@@ -328,16 +417,16 @@ class SpeedometerMonitor:
                             disk = psutil.disk_usage('/')
                     self.disk_usage = (disk.used / disk.total) * 100
                     
-                    # Network usage
-                    upload_speed, download_speed = self.get_network_speed()
+                    # Network, disk I/O, context switch and interrupt rates over the real elapsed time
+                    self.system_rates = self.rates.update_many(read_system_counters())
+                    upload_speed, download_speed = self.get_network_speed(self.system_rates)
                     self.network_upload = upload_speed
                     self.network_download = download_speed
                     
-                    # Update UI in main thread
-                    self.root.after(0, self.update_display, 
-                                  self.cpu_usage, self.memory_usage, 
-                                  self.disk_usage, upload_speed,
-                                  memory, disk, download_speed)
+                    # Hand the snapshot to the UI thread
+                    self.mailbox.publish((self.cpu_usage, self.memory_usage, 
+                                          self.disk_usage, upload_speed,
+                                          memory, disk, download_speed))
                     
                 except Exception as e:
                     print(f"Monitoring error: {e}")
@@ -347,6 +436,9 @@ class SpeedometerMonitor:
         thread = threading.Thread(target=monitor, daemon=True)
         thread.start()
     
+    def apply_snapshot(self, snapshot):
+        self.update_display(*snapshot)
+    
     def update_display(self, cpu, memory, disk, network, memory_obj, disk_obj, download_speed):
         # Update speedometers
         self.draw_speedometer(self.cpu_canvas, "CPU", cpu)
@@ -395,6 +487,7 @@ class SpeedometerMonitor:
     
     def on_closing(self):
         self.monitoring = False
+        self.clock.stop()
         self.root.destroy()
 
 if __name__ == "__main__":
@@ -6,6 +6,14 @@ import threading
 import time
 from datetime import datetime, timedelta
 
+from collector_daemon import RingReader, dashboard_sample, refresh_feed
+from rate_engine import RateEngine, read_system_counters
+from ui_mailbox import UpdateMailbox
+from frame_clock import FrameClock
+
+# Target frame rate of the UI clock
+TARGET_FPS = 30
+
 class GamingRGBMonitor:
     def __init__(self, root):
         self.root = root
@@ -33,6 +41,8 @@ class GamingRGBMonitor:
         # LED blink states
         self.led_blink_state = True
         self.blink_counter = 0
+        self.num_leds = 20
+        self.led_pools = {}  # canvas -> persistent LED item ids and lit state
         self.start_time = time.time()
         
         # Monitoring data
@@ -45,14 +55,25 @@ class GamingRGBMonitor:
         self.fan_speed = 1200
         
         # Network data for calculating speeds
-        self.prev_net_io = None
+        self.rates = RateEngine()
+        self.system_rates = {}
         self.network_samples = []
         
         self.monitoring = True
         
+        # Latest snapshot for the Tk loop; older ones are dropped, never queued
+        self.mailbox = UpdateMailbox()
+        
+        # Read from the shared collector instead of polling psutil, if it is running
+        self.feed = RingReader.attach()
+        
         self.create_gaming_ui()
         self.start_monitoring()
+        # One clock on the Tk loop drives data refresh and animation
+        self.clock = FrameClock(self.root, TARGET_FPS)
+        self.clock.add_task(lambda dt: self.mailbox.drain(self.apply_snapshot))
         self.start_led_blink()
+        self.clock.start()
     
     def create_gaming_ui(self):
         # Main container with gaming border
@@ -241,8 +262,6 @@ class GamingRGBMonitor:
     
     def draw_led_bars(self, canvas, value, label):
         """Draw 20 LED bars based on usage value"""
-        canvas.delete("all")
-        
         width = canvas.winfo_width()
         height = canvas.winfo_height()
         
@@ -257,65 +276,78 @@ class GamingRGBMonitor:
         else:
             adjusted_value = value
         
-        # LED dimensions
-        num_leds = 20
-        led_width = (width - 40) // num_leds
-        led_height = 20
-        led_spacing = 2
-        start_x = 20
+        # LED items are created once per canvas and only recoloured afterwards
+        pool = self.led_pools.get(canvas)
+        if pool is None:
+            pool = self.create_led_pool(canvas)
+        if pool['size'] != (width, height):
+            self.layout_led_pool(canvas, pool, width, height)
         
         # Calculate how many LEDs should be on
-        leds_on = int((adjusted_value / 100) * num_leds)
+        leds_on = int((adjusted_value / 100) * self.num_leds)
         
         # Determine blink state for active LEDs
         blink_on = self.led_blink_state
         
-        # Create 20 LED bars
-        for i in range(num_leds):
-            # Determine LED color based on position
-            if i < 7:  # 0-6: Green (0-35%)
-                base_color = self.colors['led_green']
-            elif i < 14:  # 7-13: Yellow (35-70%)
-                base_color = self.colors['led_yellow']
-            else:  # 14-19: Red (70-100%)
-                base_color = self.colors['led_red']
-            
-            # Determine if this LED should be on
-            led_on = i < leds_on
+        for i in range(self.num_leds):
+            lit = i < leds_on and blink_on
+            if lit == pool['lit'][i]:
+                continue
             
-            # Set LED color (on with blink or off)
-            if led_on and blink_on:
-                led_color = base_color
-            else:
-                led_color = self.colors['led_off']
-            
-            # Calculate position
+            # Only LEDs that changed state touch Tk
+            led_color = self.led_base_color(i) if lit else self.colors['led_off']
+            canvas.itemconfig(pool['leds'][i], fill=led_color)
+            canvas.itemconfig(pool['highlights'][i], state=tk.NORMAL if lit else tk.HIDDEN)
+            pool['lit'][i] = lit
+    
+    def led_base_color(self, i):
+        """LED color based on position"""
+        if i < 7:  # 0-6: Green (0-35%)
+            return self.colors['led_green']
+        elif i < 14:  # 7-13: Yellow (35-70%)
+            return self.colors['led_yellow']
+        else:  # 14-19: Red (70-100%)
+            return self.colors['led_red']
+    
+    def create_led_pool(self, canvas):
+        """Create the LED rectangles and their highlight strips, all off"""
+        pool = {'size': None, 'leds': [], 'highlights': [], 'lit': [False] * self.num_leds}
+        for i in range(self.num_leds):
+            pool['leds'].append(canvas.create_rectangle(
+                0, 0, 0, 0, fill=self.colors['led_off'], outline='#666666', width=1))
+            # Subtle gradient effect, shown only while the LED is lit
+            pool['highlights'].append(canvas.create_rectangle(
+                0, 0, 0, 0, fill='#ffffff', stipple='gray50', width=0, state=tk.HIDDEN))
+        self.led_pools[canvas] = pool
+        return pool
+    
+    def layout_led_pool(self, canvas, pool, width, height):
+        """Move existing LED items to fit the canvas size"""
+        # LED dimensions
+        led_width = (width - 40) // self.num_leds
+        led_height = 20
+        led_spacing = 2
+        start_x = 20
+        
+        for i in range(self.num_leds):
             x1 = start_x + (i * (led_width + led_spacing))
             y1 = (height - led_height) // 2
             x2 = x1 + led_width
             y2 = y1 + led_height
-            
-            # Draw LED with 3D effect
-            canvas.create_rectangle(x1, y1, x2, y2, fill=led_color, outline='#666666', width=1)
-            
-            # Add subtle gradient effect
-            if led_on and blink_on:
-                canvas.create_rectangle(x1, y1, x2, y1 + 3, fill='#ffffff', stipple='gray50', width=0)
+            canvas.coords(pool['leds'][i], x1, y1, x2, y2)
+            canvas.coords(pool['highlights'][i], x1, y1, x2, y1 + 3)
+        pool['size'] = (width, height)
     
     def start_led_blink(self):
-        """Start LED blinking animation"""
-        def blink():
-            while self.monitoring:
-                self.led_blink_state = not self.led_blink_state
-                self.blink_counter += 1
-                
-                # Update all LED displays
-                self.root.after(0, self.update_led_displays)
-                
-                time.sleep(0.3)  # Faster blink for gaming feel
+        """Start LED blinking animation on the frame clock"""
+        self.clock.add_task(self.blink_leds, interval=0.3)  # Faster blink for gaming feel
+    
+    def blink_leds(self, dt):
+        self.led_blink_state = not self.led_blink_state
+        self.blink_counter += 1
         
-        blink_thread = threading.Thread(target=blink, daemon=True)
-        blink_thread.start()
+        # Update all LED displays
+        self.update_led_displays()
     
     def update_led_displays(self):
         """Update all LED bar displays"""
@@ -331,20 +363,10 @@ class GamingRGBMonitor:
             
             self.draw_led_bars(canvas, value, label.upper())
     
-    def get_network_speed(self):
-        """Get current network upload/download speed in MB/s"""
-        current_net_io = psutil.net_io_counters()
-        
-        if self.prev_net_io is None:
-            self.prev_net_io = current_net_io
-            return 0, 0
-        
-        # Calculate speeds in MB/s
-        time_diff = 1  # 1 second interval
-        upload_speed = (current_net_io.bytes_sent - self.prev_net_io.bytes_sent) / (1024 * 1024) / time_diff
-        download_speed = (current_net_io.bytes_recv - self.prev_net_io.bytes_recv) / (1024 * 1024) / time_diff
-        
-        self.prev_net_io = current_net_io
+    def get_network_speed(self, rates):
+        """Get current network upload/download speed in MB/s from per-second byte rates"""
+        upload_speed = rates.get('net_bytes_sent', 0) / (1024 * 1024)
+        download_speed = rates.get('net_bytes_recv', 0) / (1024 * 1024)
         
         # Smooth the network speed (average last 3 samples)
         self.network_samples.append(upload_speed)
@@ -377,12 +399,51 @@ class GamingRGBMonitor:
         seconds = uptime_seconds % 60
         return f"{hours}:{minutes:02d}:{seconds:02d}"
     
+    def read_shared_sample(self):
+        """Update the display from the collector daemon's latest sample"""
+        sample = self.feed.latest()
+        if sample is None:
+            return
+        sample = dashboard_sample(sample)
+        
+        self.cpu_usage = sample.cpu_percent
+        self.memory_usage = sample.memory.percent
+        self.disk_usage = (sample.disk.used / sample.disk.total) * 100 if sample.disk.total else 0
+        
+        # Rates over the time between the daemon's own samples
+        self.system_rates = self.rates.update_many({
+            'net_bytes_sent': sample.net_io.bytes_sent,
+            'net_bytes_recv': sample.net_io.bytes_recv
+        }, sample.timestamp)
+        upload_speed, download_speed = self.get_network_speed(self.system_rates)
+        self.network_upload = upload_speed
+        self.network_download = download_speed
+        
+        self.cpu_temp = sample.cpu_temp or 45.0
+        self.fan_speed = 800 + int((self.cpu_temp - 40) * 50)
+        self.fan_speed = max(800, min(self.fan_speed, 2000))
+        
+        self.mailbox.publish((self.cpu_usage, self.memory_usage, 
+                              self.disk_usage, upload_speed,
+                              sample.memory, sample.disk, download_speed))
+    
     def start_monitoring(self):
         def monitor():
+            psutil.cpu_percent(interval=None)  # prime the CPU baseline
             while self.monitoring:
                 try:
-                    # CPU usage
-                    self.cpu_usage = psutil.cpu_percent(interval=0.5)
+                    # Re-attach, or fall back to local polling, once the daemon stops publishing
+                    feed = refresh_feed(self.feed)
+                    if feed is not self.feed:
+                        self.feed = feed
+                        self.rates.reset()
+                    if self.feed:
+                        self.read_shared_sample()
+                        time.sleep(1)
+                        continue
+                    
+                    # CPU usage since the previous pass; never blocks
+                    self.cpu_usage = psutil.cpu_percent(interval=None)
                     
                     # Memory usage
                     memory = psutil.virtual_memory()
@@ -398,8 +459,9 @@ class GamingRGBMonitor:
                             disk = psutil.disk_usage('/')
                     self.disk_usage = (disk.used / disk.total) * 100
                     
-                    # Network usage
-                    upload_speed, download_speed = self.get_network_speed()
+                    # Network, disk I/O, context switch and interrupt rates over the real elapsed time
+                    self.system_rates = self.rates.update_many(read_system_counters())
+                    upload_speed, download_speed = self.get_network_speed(self.system_rates)
                     self.network_upload = upload_speed
                     self.network_download = download_speed
                     
@@ -410,11 +472,10 @@ class GamingRGBMonitor:
                     self.fan_speed = 800 + int((self.cpu_temp - 40) * 50)
                     self.fan_speed = max(800, min(self.fan_speed, 2000))
                     
-                    # Update UI in main thread
-                    self.root.after(0, self.update_display, 
-                                  self.cpu_usage, self.memory_usage, 
-                                  self.disk_usage, upload_speed,
-                                  memory, disk, download_speed)
+                    # Hand the snapshot to the UI thread
+                    self.mailbox.publish((self.cpu_usage, self.memory_usage, 
+                                          self.disk_usage, upload_speed,
+                                          memory, disk, download_speed))
                     
                 except Exception as e:
                     print(f"Monitoring error: {e}")
@@ -424,6 +485,9 @@ class GamingRGBMonitor:
         thread = threading.Thread(target=monitor, daemon=True)
         thread.start()
     
+    def apply_snapshot(self, snapshot):
+        self.update_display(*snapshot)
+    
     def update_display(self, cpu, memory, disk, network, memory_obj, disk_obj, download_speed):
         # Update value displays
         self.value_labels['cpu'].config(text=f"{cpu:.1f}%")
@@ -471,6 +535,7 @@ class GamingRGBMonitor:
     
     def on_closing(self):
         self.monitoring = False
+        self.clock.stop()
         self.root.destroy()
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+import math
+import tkinter as tk
+
+def nice_step(raw_step):
+    """Round a tick step up to 1, 2 or 5 times a power of ten"""
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    for multiple in (1, 2, 5, 10):
+        if raw_step <= multiple * magnitude:
+            return multiple * magnitude
+    return 10 * magnitude
+
+def nice_limits(low, high, divisions):
+    """Axis limits enclosing [low, high] on a round tick step"""
+    if high <= low:
+        high = low + 1
+    step = nice_step((high - low) / divisions)
+    return math.floor(low / step) * step, math.ceil(high / step) * step
+
+def format_tick(value):
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:g}"
+
+class TkChart(tk.Canvas):
+    """Line chart drawn with plain canvas items: axes, grid, tick labels and one polyline.
+
+    Static items are only redrawn on resize or when autoscale changes the limits;
+    a data update is a single coords() call on the line.
+    """
+    MARGINS = {'left': 50, 'right': 15, 'top': 15, 'bottom': 40}
+
+    def __init__(self, master, xlim=(0, 1), ylim=(0, 1), autoscale=False, color='#ff0000',
+                 xlabel='', ylabel='', xticks=6, yticks=5, bg='#1e1e1e', fg='white',
+                 grid_color='#3a3a3a', line_width=2, **kw):
+        kw.setdefault('highlightthickness', 0)
+        super().__init__(master, bg=bg, **kw)
+        self.xlim = xlim
+        self.ylim = ylim
+        self.autoscale = autoscale
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.xticks = xticks
+        self.yticks = yticks
+        self.fg = fg
+        self.grid_color = grid_color
+
+        self.xdata = []
+        self.ydata = []
+        self.plot_box = (0, 0, 1, 1)
+        self.line = self.create_line(0, 0, 0, 0, fill=color, width=line_width)
+
+        self.bind('<Configure>', self.on_resize)
+
+    def on_resize(self, event):
+        self.redraw_static()
+        self.redraw_line()
+
+    def set_data(self, xdata, ydata):
+        self.xdata = list(xdata)
+        self.set_ydata(ydata)
+
+    def set_ydata(self, ydata):
+        self.ydata = list(ydata)
+        if self.autoscale and self.ydata:
+            ylim = self.scaled_limits(min(self.ydata), max(self.ydata))
+            if ylim != self.ylim:
+                self.ylim = ylim
+                self.redraw_static()
+        self.redraw_line()
+
+    def scaled_limits(self, low, high):
+        # Keep the current limits while the data fits and fills at least half of them,
+        # so the tick labels don't change on every sample
+        ymin, ymax = self.ylim
+        if ymin <= low and high <= ymax and high - low >= (ymax - ymin) / 2:
+            return self.ylim
+        return nice_limits(low, high, self.yticks)
+
+    def to_pixels(self, x, y):
+        x0, y0, x1, y1 = self.plot_box
+        xmin, xmax = self.xlim
+        ymin, ymax = self.ylim
+        px = x0 + (x - xmin) / (xmax - xmin) * (x1 - x0)
+        py = y1 - (y - ymin) / (ymax - ymin) * (y1 - y0)
+        return px, min(y1, max(y0, py))
+
+    def redraw_line(self):
+        points = list(zip(self.xdata, self.ydata))
+        if len(points) < 2:
+            return
+        coords = []
+        for x, y in points:
+            coords.extend(self.to_pixels(x, y))
+        self.coords(self.line, *coords)
+
+    def redraw_static(self):
+        """Frame, grid, tick labels and axis labels for the current size and limits"""
+        self.delete('static')
+        width = self.winfo_width()
+        height = self.winfo_height()
+        x0 = self.MARGINS['left']
+        y0 = self.MARGINS['top']
+        x1 = max(x0 + 1, width - self.MARGINS['right'])
+        y1 = max(y0 + 1, height - self.MARGINS['bottom'])
+        self.plot_box = (x0, y0, x1, y1)
+
+        xmin, xmax = self.xlim
+        ymin, ymax = self.ylim
+        for i in range(self.yticks + 1):
+            value = ymin + (ymax - ymin) * i / self.yticks
+            _, py = self.to_pixels(xmin, value)
+            self.create_line(x0, py, x1, py, fill=self.grid_color, tags='static')
+            self.create_text(x0 - 6, py, text=format_tick(value), fill=self.fg,
+                             anchor='e', font=('Arial', 8), tags='static')
+        for i in range(self.xticks + 1):
+            value = xmin + (xmax - xmin) * i / self.xticks
+            px, _ = self.to_pixels(value, ymin)
+            self.create_line(px, y0, px, y1, fill=self.grid_color, tags='static')
+            self.create_text(px, y1 + 6, text=format_tick(value), fill=self.fg,
+                             anchor='n', font=('Arial', 8), tags='static')
+
+        self.create_rectangle(x0, y0, x1, y1, outline=self.fg, tags='static')
+        if self.xlabel:
+            self.create_text((x0 + x1) / 2, height - 4, text=self.xlabel, fill=self.fg,
+                             anchor='s', font=('Arial', 9), tags='static')
+        if self.ylabel:
+            self.create_text(12, (y0 + y1) / 2, text=self.ylabel, fill=self.fg,
+                             angle=90, font=('Arial', 9), tags='static')
+        self.tag_raise(self.line)
@@ -0,0 +1,585 @@
+import os
+import json
+import mmap
+import struct
+import bisect
+import logging
+import threading
+import time
+
+import gorilla
+
+# NumPy is optional - queries return lists without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger('SystemMonitor')
+
+# Segment file layout: magic, version, header length, JSON field list, then
+# fixed-width little-endian float64 records [timestamp, *values]. A segment whose
+# header doesn't match the writer's fields is continued in seg_<start>_<part> files.
+SEGMENT_MAGIC = b'SYSMONTS'
+SEGMENT_VERSION = 1
+SEGMENT_PREFIX_FORMAT = '<8sII'
+SEGMENT_PREFIX_SIZE = struct.calcsize(SEGMENT_PREFIX_FORMAT)
+SEGMENT_SUFFIX = '.tsd'
+
+# Sealed segments are rewritten as one Gorilla-compressed block
+COMPRESSED_MAGIC = b'SYSMONTZ'
+COMPRESSED_SUFFIX = '.tsz'
+
+class SegmentFile:
+    """Read-only mmap of one segment file"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            prefix = f.read(SEGMENT_PREFIX_SIZE)
+            magic, version, header_length = struct.unpack(SEGMENT_PREFIX_FORMAT, prefix)
+            if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+                raise ValueError(f"{path} is not a metrics segment")
+            self.fields = json.loads(f.read(header_length))
+
+            self.data_offset = SEGMENT_PREFIX_SIZE + header_length
+            self.record_format = '<' + 'd' * (len(self.fields) + 1)
+            self.record_size = struct.calcsize(self.record_format)
+
+            size = os.fstat(f.fileno()).st_size
+            # A trailing partial record (crash mid-write) is ignored here and
+            # truncated away before the writer appends again
+            self.count = max(0, (size - self.data_offset) // self.record_size)
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def timestamp_at(self, i):
+        return struct.unpack_from('<d', self.mm, self.data_offset + i * self.record_size)[0]
+
+    def search(self, timestamp):
+        """Index of the first record at or after `timestamp`"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp_at(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def read_range(self, first, last):
+        """Rows [first, last) as a (rows, 1 + fields) array or list of tuples"""
+        if NUMPY_AVAILABLE:
+            rows = np.frombuffer(self.mm, dtype='<f8', count=(last - first) * (len(self.fields) + 1),
+                                 offset=self.data_offset + first * self.record_size)
+            # Copy out so the mmap can be closed
+            return rows.reshape(last - first, len(self.fields) + 1).copy()
+        start = self.data_offset + first * self.record_size
+        end = self.data_offset + last * self.record_size
+        return list(struct.iter_unpack(self.record_format, self.mm[start:end]))
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+
+class CompressedSegment:
+    """Decoded Gorilla segment with the same read interface as SegmentFile"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(COMPRESSED_MAGIC):
+            raise ValueError(f"{path} is not a compressed metrics segment")
+
+        self.timestamps, columns = gorilla.decode_block(memoryview(data)[len(COMPRESSED_MAGIC):])
+        self.fields = list(columns)
+        self.columns = [columns[field] for field in self.fields]
+        self.count = len(self.timestamps)
+
+    def timestamp_at(self, i):
+        return self.timestamps[i]
+
+    def search(self, timestamp):
+        return bisect.bisect_left(self.timestamps, timestamp)
+
+    def read_range(self, first, last):
+        rows = [self.timestamps[first:last]] + [column[first:last] for column in self.columns]
+        if NUMPY_AVAILABLE:
+            return np.column_stack([np.asarray(values, dtype='<f8') for values in rows])
+        return list(zip(*rows))
+
+    def close(self):
+        pass
+
+def open_segment(path):
+    if path.endswith(COMPRESSED_SUFFIX):
+        return CompressedSegment(path)
+    return SegmentFile(path)
+
+class TimeSeriesStore:
+    """Append-only store of fixed-width samples in time-partitioned segment files"""
+    def __init__(self, directory, fields, segment_seconds=3600, batch_size=60, flush_interval=10.0,
+                 readonly=False):
+        self.directory = directory
+        self.fields = list(fields)
+        self.segment_seconds = segment_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.record_format = '<' + 'd' * (len(self.fields) + 1)
+        self.pending = bytearray()
+        self.pending_start = None
+        self.pending_count = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.active = None  # (segment_start, path) checked for appending
+
+        os.makedirs(directory, exist_ok=True)
+        self.lock_file = None
+        if not readonly:
+            self.acquire_writer_lock()
+
+    def acquire_writer_lock(self):
+        """Only one process may append to a store directory"""
+        if fcntl is None:
+            return
+        self.lock_file = open(os.path.join(self.directory, '.writer.lock'), 'w')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.lock_file.close()
+            self.lock_file = None
+            raise RuntimeError(f"Another process is already writing to {self.directory}")
+
+    def segment_path(self, segment_start, part=0):
+        name = f'seg_{segment_start:012d}' + (f'_{part}' if part else '')
+        return os.path.join(self.directory, name + SEGMENT_SUFFIX)
+
+    def prepare_segment(self, path):
+        """Make an existing segment safe to append to; False if it belongs to other fields.
+
+        A trailing partial record is cut off so the next batch stays aligned.
+        """
+        if os.path.exists(path[:-len(SEGMENT_SUFFIX)] + COMPRESSED_SUFFIX):
+            return False  # already sealed
+        if not os.path.exists(path):
+            return True
+        with open(path, 'r+b') as f:
+            size = os.fstat(f.fileno()).st_size
+            prefix = f.read(SEGMENT_PREFIX_SIZE)
+            if len(prefix) < SEGMENT_PREFIX_SIZE:
+                f.truncate(0)  # crashed while writing the header
+                return True
+            magic, version, header_length = struct.unpack(SEGMENT_PREFIX_FORMAT, prefix)
+            if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+                return False
+            header = f.read(header_length)
+            if len(header) < header_length:
+                f.truncate(0)
+                return True
+            if json.loads(header) != self.fields:
+                return False
+
+            data_offset = SEGMENT_PREFIX_SIZE + header_length
+            record_size = struct.calcsize(self.record_format)
+            whole = data_offset + max(0, size - data_offset) // record_size * record_size
+            if size != whole:
+                f.truncate(whole)
+        return True
+
+    def writable_segment(self, segment_start):
+        """Path the pending batch goes to, checked once per segment"""
+        if self.active is None or self.active[0] != segment_start:
+            part = 0
+            while not self.prepare_segment(self.segment_path(segment_start, part)):
+                part += 1
+            self.active = (segment_start, self.segment_path(segment_start, part))
+        return self.active[1]
+
+    def segment_start(self, timestamp):
+        return int(timestamp // self.segment_seconds) * self.segment_seconds
+
+    def segments(self):
+        """Sorted (segment_start, path) pairs for every segment on disk, continuation parts in order"""
+        found = {}
+        for name in os.listdir(self.directory):
+            if not name.startswith('seg_'):
+                continue
+            stem, suffix = os.path.splitext(name)
+            if suffix not in (SEGMENT_SUFFIX, COMPRESSED_SUFFIX):
+                continue
+            # A compressed copy wins if sealing was interrupted before cleanup
+            start, _, part = stem[4:].partition('_')
+            key = (int(start), int(part or 0))
+            if suffix == COMPRESSED_SUFFIX or key not in found:
+                found[key] = os.path.join(self.directory, name)
+        return [(segment_start, path) for (segment_start, _), path in sorted(found.items())]
+
+    def append(self, timestamp, values):
+        """Buffer one record; records are written to disk in batches"""
+        with self.lock:
+            segment_start = self.segment_start(timestamp)
+            if self.pending_start is not None and segment_start != self.pending_start:
+                self._flush()
+            self.pending_start = segment_start
+            self.pending += struct.pack(self.record_format, timestamp, *values)
+            self.pending_count += 1
+
+            if (self.pending_count >= self.batch_size or
+                    time.monotonic() - self.last_flush >= self.flush_interval):
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+
+        path = self.writable_segment(self.pending_start)
+        with open(path, 'ab') as f:
+            if f.tell() == 0:
+                header = json.dumps(self.fields).encode()
+                f.write(struct.pack(SEGMENT_PREFIX_FORMAT, SEGMENT_MAGIC, SEGMENT_VERSION, len(header)))
+                f.write(header)
+            f.write(self.pending)
+
+        self.pending = bytearray()
+        self.pending_count = 0
+
+    def query(self, start, end, fields=None):
+        """Columns for samples with start <= timestamp < end.
+
+        Returns {'timestamp': ..., field: ...} as NumPy arrays, or lists without NumPy.
+        Fields missing from an older segment are filled with NaN.
+        """
+        self.flush()
+        fields = self.fields if fields is None else list(fields)
+        parts = []
+
+        for segment_start, path in self.segments():
+            if segment_start >= end or segment_start + self.segment_seconds <= start:
+                continue
+            segment = open_segment(path)
+            try:
+                if not segment.count:
+                    continue
+                first = segment.search(start)
+                last = segment.search(end)
+                if first < last:
+                    parts.append((segment.fields, segment.read_range(first, last)))
+            finally:
+                segment.close()
+
+        return self._columns(parts, fields)
+
+    def _columns(self, parts, fields):
+        if NUMPY_AVAILABLE:
+            columns = {'timestamp': np.concatenate([rows[:, 0] for _, rows in parts])
+                       if parts else np.empty(0)}
+            for field in fields:
+                chunks = []
+                for segment_fields, rows in parts:
+                    if field in segment_fields:
+                        chunks.append(rows[:, segment_fields.index(field) + 1])
+                    else:
+                        chunks.append(np.full(len(rows), np.nan))
+                columns[field] = np.concatenate(chunks) if chunks else np.empty(0)
+            return columns
+
+        columns = {'timestamp': [row[0] for _, rows in parts for row in rows]}
+        for field in fields:
+            values = []
+            for segment_fields, rows in parts:
+                if field in segment_fields:
+                    i = segment_fields.index(field) + 1
+                    values.extend(row[i] for row in rows)
+                else:
+                    values.extend([float('nan')] * len(rows))
+            columns[field] = values
+        return columns
+
+    def _edge_timestamp(self, newest):
+        self.flush()
+        segments = self.segments()
+        for segment_start, path in (reversed(segments) if newest else segments):
+            segment = open_segment(path)
+            try:
+                if segment.count:
+                    return segment.timestamp_at(segment.count - 1 if newest else 0)
+            finally:
+                segment.close()
+        return None
+
+    def stored_fields(self):
+        """Field list of the newest segment on disk (useful for read-only stores)"""
+        segments = self.segments()
+        if not segments:
+            return []
+        segment = open_segment(segments[-1][1])
+        segment.close()
+        return segment.fields
+
+    def first_timestamp(self):
+        return self._edge_timestamp(newest=False)
+
+    def last_timestamp(self):
+        return self._edge_timestamp(newest=True)
+
+    def seal_before(self, cutoff):
+        """Gorilla-compress finished segments that end at or before `cutoff`"""
+        for segment_start, path in self.segments():
+            if (not path.endswith(SEGMENT_SUFFIX) or segment_start == self.pending_start or
+                    segment_start + self.segment_seconds > cutoff):
+                continue
+
+            segment = SegmentFile(path)
+            try:
+                rows = segment.read_range(0, segment.count) if segment.count else []
+                timestamps = [row[0] for row in rows]
+                columns = {field: [row[i + 1] for row in rows] for i, field in enumerate(segment.fields)}
+            finally:
+                segment.close()
+
+            compressed_path = path[:-len(SEGMENT_SUFFIX)] + COMPRESSED_SUFFIX
+            with open(compressed_path + '.tmp', 'wb') as f:
+                f.write(COMPRESSED_MAGIC)
+                f.write(gorilla.encode_block(timestamps, columns))
+            os.replace(compressed_path + '.tmp', compressed_path)
+            os.remove(path)
+            self.forget_segment(path)
+
+    def drop_before(self, cutoff):
+        """Delete whole segments that end at or before `cutoff`"""
+        with self.lock:
+            for segment_start, path in self.segments():
+                if segment_start + self.segment_seconds <= cutoff and segment_start != self.pending_start:
+                    os.remove(path)
+                    self.forget_segment(path)
+
+    def forget_segment(self, path):
+        if self.active is not None and self.active[1] == path:
+            self.active = None
+
+    def close(self):
+        self.flush()
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
+# Rollup statistics kept per field in the 1m/1h tiers
+ROLLUP_STATS = ('min', 'max', 'avg', 'last')
+
+def rollup_fields(fields):
+    return ['sample_count'] + [f'{field}_{stat}' for field in fields for stat in ROLLUP_STATS]
+
+def compute_rollups(columns, fields, resolution, from_rollup=False):
+    """Aggregate sorted samples into buckets of `resolution` seconds.
+
+    `columns` comes from TimeSeriesStore.query(). With from_rollup the input is
+    itself a rollup tier, so stats are combined (averages weighted by sample_count).
+    Returns (bucket_timestamps, rows) with rows ordered like rollup_fields(fields).
+    """
+    timestamps = columns['timestamp']
+    if not len(timestamps):
+        return [], []
+
+    if NUMPY_AVAILABLE:
+        return _compute_rollups_numpy(columns, fields, resolution, from_rollup)
+
+    buckets = []
+    rows = []
+    start = 0
+    while start < len(timestamps):
+        bucket = timestamps[start] // resolution * resolution
+        end = start
+        while end < len(timestamps) and timestamps[end] // resolution * resolution == bucket:
+            end += 1
+
+        if from_rollup:
+            weights = columns['sample_count'][start:end]
+        else:
+            weights = [1.0] * (end - start)
+        row = [sum(weights)]
+        for field in fields:
+            if from_rollup:
+                mins = columns[f'{field}_min'][start:end]
+                maxes = columns[f'{field}_max'][start:end]
+                avgs = columns[f'{field}_avg'][start:end]
+                lasts = columns[f'{field}_last'][start:end]
+            else:
+                mins = maxes = avgs = lasts = columns[field][start:end]
+
+            pairs = [(value, weight) for value, weight in zip(avgs, weights) if value == value]
+            valid_mins = [value for value in mins if value == value]
+            valid_maxes = [value for value in maxes if value == value]
+            total_weight = sum(weight for _, weight in pairs)
+            row.extend([
+                min(valid_mins) if valid_mins else float('nan'),
+                max(valid_maxes) if valid_maxes else float('nan'),
+                sum(value * weight for value, weight in pairs) / total_weight if total_weight else float('nan'),
+                lasts[-1]
+            ])
+
+        buckets.append(float(bucket))
+        rows.append(row)
+        start = end
+    return buckets, rows
+
+def _compute_rollups_numpy(columns, fields, resolution, from_rollup):
+    timestamps = np.asarray(columns['timestamp'])
+    bucket_ids = np.floor(timestamps / resolution) * resolution
+    buckets, starts = np.unique(bucket_ids, return_index=True)
+    ends = np.append(starts[1:], len(timestamps))
+
+    if from_rollup:
+        weights = np.nan_to_num(np.asarray(columns['sample_count']))
+    else:
+        weights = np.ones(len(timestamps))
+
+    out = [np.add.reduceat(weights, starts)]
+    for field in fields:
+        if from_rollup:
+            mins = np.asarray(columns[f'{field}_min'])
+            maxes = np.asarray(columns[f'{field}_max'])
+            avgs = np.asarray(columns[f'{field}_avg'])
+            lasts = np.asarray(columns[f'{field}_last'])
+        else:
+            mins = maxes = avgs = lasts = np.asarray(columns[field])
+
+        valid = ~np.isnan(avgs)
+        valid_weights = np.where(valid, weights, 0)
+        total_weight = np.add.reduceat(valid_weights, starts)
+        weighted_sum = np.add.reduceat(np.where(valid, avgs, 0) * valid_weights, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = np.where(total_weight > 0, weighted_sum / total_weight, np.nan)
+
+        out.extend([
+            np.fmin.reduceat(mins, starts),
+            np.fmax.reduceat(maxes, starts),
+            avg,
+            lasts[ends - 1]
+        ])
+    return buckets, np.column_stack(out)
+
+class TieredStore:
+    """Raw samples plus 1m/1h rollups, each tier with its own retention.
+
+    `tiers` is a list of dicts (name, resolution, retention, segment_seconds and
+    optionally compress_after), finest first; the first tier holds raw samples.
+    """
+    def __init__(self, directory, fields, tiers, batch_size=60, readonly=False):
+        self.fields = list(fields)
+        self.tiers = []
+        for i, tier in enumerate(tiers):
+            tier_fields = self.fields if i == 0 else rollup_fields(self.fields)
+            store = TimeSeriesStore(os.path.join(directory, tier['name']), tier_fields,
+                                    tier['segment_seconds'], batch_size if i == 0 else 1,
+                                    readonly=readonly)
+            self.tiers.append(dict(tier, store=store))
+
+        self.raw = self.tiers[0]['store']
+        self.compaction_thread = None
+        self.stop_event = threading.Event()
+
+    def append(self, timestamp, values):
+        self.raw.append(timestamp, values)
+
+    def compact(self, now=None, max_span=86400):
+        """Roll complete buckets of each tier up into the next coarser tier"""
+        now = time.time() if now is None else now
+        for source, target in zip(self.tiers, self.tiers[1:]):
+            resolution = target['resolution']
+            target_store = target['store']
+
+            last = target_store.last_timestamp()
+            if last is not None:
+                start = last + resolution
+            else:
+                first = source['store'].first_timestamp()
+                if first is None:
+                    continue
+                start = first // resolution * resolution
+
+            # Only whole buckets; the current one is still filling up
+            end = now // resolution * resolution
+            while start < end:
+                chunk_end = min(end, start + max(max_span, resolution))
+                columns = source['store'].query(start, chunk_end)
+                buckets, rows = compute_rollups(columns, self.fields, resolution,
+                                                from_rollup=source is not self.tiers[0])
+                for bucket, row in zip(buckets, rows):
+                    target_store.append(bucket, row)
+                target_store.flush()
+                start = chunk_end
+
+        self.enforce_retention(now)
+        for tier in self.tiers:
+            if tier.get('compress_after') is not None:
+                tier['store'].seal_before(now - tier['compress_after'])
+
+    def enforce_retention(self, now=None):
+        now = time.time() if now is None else now
+        for tier in self.tiers:
+            tier['store'].drop_before(now - tier['retention'])
+
+    def start_compaction(self, interval=60):
+        """Run compact() on a background thread every `interval` seconds"""
+        def run():
+            while not self.stop_event.wait(interval):
+                try:
+                    self.compact()
+                except Exception:
+                    # Keep the thread alive; retention and rollups retry next interval
+                    logger.exception("Rollup compaction failed")
+
+        self.compaction_thread = threading.Thread(target=run, daemon=True)
+        self.compaction_thread.start()
+
+    def choose_tier(self, start, end, max_points=None, now=None):
+        """Coarsest tier needed: the finest one that still holds `start` and fits max_points"""
+        now = time.time() if now is None else now
+        covering = [tier for tier in self.tiers if now - tier['retention'] <= start] or self.tiers[-1:]
+        if not max_points:
+            return covering[0]
+        for tier in covering:
+            if (end - start) / tier['resolution'] <= max_points:
+                return tier
+        return covering[-1]
+
+    def query(self, start, end, max_points=None, fields=None):
+        """Columns for [start, end) from the tier chosen by choose_tier().
+
+        Raw tiers return plain field columns. Rollup tiers return the average
+        under the plain field name plus field_min, field_max and field_last.
+        The chosen tier's name and resolution are included in the result.
+        """
+        tier = self.choose_tier(start, end, max_points)
+        fields = self.fields if fields is None else list(fields)
+
+        if tier is self.tiers[0]:
+            columns = tier['store'].query(start, end, fields)
+        else:
+            stat_fields = [f'{field}_{stat}' for field in fields for stat in ROLLUP_STATS]
+            columns = tier['store'].query(start, end, ['sample_count'] + stat_fields)
+            for field in fields:
+                columns[field] = columns.pop(f'{field}_avg')
+
+        columns['tier'] = tier['name']
+        columns['resolution'] = tier['resolution']
+        return columns
+
+    def flush(self):
+        for tier in self.tiers:
+            tier['store'].flush()
+
+    def close(self):
+        self.stop_event.set()
+        for tier in self.tiers:
+            tier['store'].close()
@@ -0,0 +1,55 @@
+import threading
+
+class UpdateMailbox:
+    """Single-slot, latest-wins handoff of snapshots from a worker thread to the Tk loop.
+
+    Publishing never blocks on the UI: a snapshot the UI has not taken yet is
+    simply replaced, so nothing can queue up behind a slow frame.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.pending = 0  # publishes since the last take()
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0    # snapshots replaced before the UI saw them
+        self.coalesced = 0  # deliveries that stood in for more than one publish
+
+    def publish(self, snapshot):
+        with self.lock:
+            if self.pending:
+                self.dropped += 1
+            self.snapshot = snapshot
+            self.pending += 1
+            self.published += 1
+
+    def take(self):
+        """Newest unseen snapshot, or None if nothing was published since the last take"""
+        with self.lock:
+            if not self.pending:
+                return None
+            if self.pending > 1:
+                self.coalesced += 1
+            snapshot = self.snapshot
+            self.snapshot = None
+            self.pending = 0
+            self.delivered += 1
+            return snapshot
+
+    def drain(self, handler):
+        """Pass the newest unseen snapshot to `handler`; a no-op when there is none"""
+        snapshot = self.take()
+        if snapshot is None:
+            return False
+        handler(snapshot)
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                'published': self.published,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced
+            }